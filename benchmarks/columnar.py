@@ -0,0 +1,49 @@
+"""Benchmark the memory of a list of ReportValue objects against columns."""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from powerfox import ReportColumns, ReportValue
+from powerfox.decoders import data_decoder
+
+from .payloads import report_values
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# A year of hourly values for both consumption and feed-in.
+COUNT = 24 * 366 * 2
+
+
+def _objects(raw: list[dict[str, Any]]) -> list[ReportValue]:
+    """Decode the report values into objects."""
+    return data_decoder(list[ReportValue]).decode(raw)
+
+
+def _allocated(build: Callable[[], Any]) -> int:
+    """Return the bytes still allocated by the result of `build`."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main(count: int = COUNT) -> None:
+    """Print the memory taken by both representations."""
+    raw = report_values(count)
+    objects = _allocated(lambda: _objects(raw))
+    columns = _allocated(lambda: ReportColumns.from_raw(raw))
+    print(f"{count} report values")
+    print(f"{'list[ReportValue]':<20}{objects / 1024:>10.0f} KiB")
+    print(f"{'ReportColumns':<20}{columns / 1024:>10.0f} KiB")
+    print(f"{'reduction':<20}{objects / columns:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
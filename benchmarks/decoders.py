@@ -0,0 +1,51 @@
+"""Benchmark building a decoder per call against the shared decoder registry."""
+
+from __future__ import annotations
+
+import timeit
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from mashumaro.codecs.orjson import ORJSONDecoder
+
+from powerfox import Device, DeviceReport, LocalResponse
+from powerfox.decoders import PowerOptiVariant, json_decoder
+
+FIXTURES = Path(__file__).parents[1] / "tests" / "fixtures"
+
+CASES: list[tuple[str, Any, str]] = [
+    ("all_devices", list[Device], "all_devices.json"),
+    ("device", PowerOptiVariant, "power_meter_full.json"),
+    ("report", DeviceReport, "power_report.json"),
+    ("local value", LocalResponse, "local_value.json"),
+]
+
+
+def _build_and_decode(shape: Any, payload: bytes) -> Any:
+    """Decode the way the clients did before the registry existed."""
+    return ORJSONDecoder(shape).decode(payload)
+
+
+def _registry_decode(shape: Any, payload: bytes) -> Any:
+    """Decode using the shared decoder registry."""
+    return json_decoder(shape).decode(payload)
+
+
+def _per_call(func: Any, number: int) -> float:
+    """Return the best per-call time in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main(number: int = 200) -> None:
+    """Print the per-call decode cost before and after the registry."""
+    print(f"{'case':<14}{'new decoder':>14}{'registry':>14}{'speedup':>10}")
+    for name, shape, fixture in CASES:
+        payload = (FIXTURES / fixture).read_bytes()
+        before = _per_call(partial(_build_and_decode, shape, payload), number)
+        after = _per_call(partial(_registry_decode, shape, payload), number)
+        print(f"{name:<14}{before:>11.1f} us{after:>11.1f} us{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark the embedded API error check against the previous implementation.
+
+The previous check scanned the raw body for `"StatusCode"` and, on a match,
+parsed the whole body again with the standard library `json` module before
+the regular orjson parse. The current check looks at the already parsed
+payload instead.
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from collections import Counter
+from contextlib import suppress
+from functools import partial
+from typing import Any
+
+import orjson
+
+from powerfox import Powerfox, PowerfoxError
+
+from .payloads import error_envelope, report_payload
+
+PARSES: Counter[str] = Counter()
+
+
+def _json_loads(body: bytes) -> Any:
+    """Parse with the standard library, counting the call."""
+    PARSES["json"] += 1
+    return json.loads(body)
+
+
+def _orjson_loads(body: bytes) -> Any:
+    """Parse with orjson, counting the call."""
+    PARSES["orjson"] += 1
+    return orjson.loads(body)
+
+
+def _legacy(client: Powerfox, body: bytes) -> Any:
+    """Check and parse the body the way the client did before."""
+    if b'"StatusCode"' in body:
+        api_response = _json_loads(body)
+        client._raise_for_embedded_api_error(api_response)
+    return _orjson_loads(body)
+
+
+def _current(client: Powerfox, body: bytes) -> Any:
+    """Check and parse the body the way the client does now."""
+    data = _orjson_loads(body)
+    client._raise_for_embedded_api_error(data)
+    return data
+
+
+def _swallow(func: Any) -> None:
+    """Call `func`, ignoring the Powerfox error the envelope raises."""
+    with suppress(PowerfoxError):
+        func()
+
+
+def main(number: int = 50) -> None:
+    """Print cost and parse count per response for both implementations."""
+    client = Powerfox(username="user", password="pass")
+    # A year of hourly values which happens to contain the envelope key.
+    large_report = {**report_payload(24 * 366), "StatusCode": 200}
+    cases = {
+        "200-OK error envelope": orjson.dumps(error_envelope()),
+        "large report": orjson.dumps(large_report),
+    }
+
+    print(f"{'case':<24}{'impl':>9}{'per call':>14}{'parses':>18}")
+    for name, body in cases.items():
+        for label, impl in (("legacy", _legacy), ("current", _current)):
+            PARSES.clear()
+            _swallow(partial(impl, client, body))
+            parses = ", ".join(f"{k}={v}" for k, v in sorted(PARSES.items()))
+            per_call = min(
+                timeit.repeat(
+                    partial(_swallow, partial(impl, client, body)),
+                    number=number,
+                    repeat=5,
+                )
+            )
+            print(
+                f"{name:<24}{label:>9}{per_call / number * 1e6:>11.1f} us{parses:>18}"
+            )
+
+
+if __name__ == "__main__":
+    main()
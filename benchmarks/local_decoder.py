@@ -0,0 +1,34 @@
+"""Benchmark the LocalResponse decoder against the LocalSample fast path."""
+
+from __future__ import annotations
+
+import timeit
+from functools import partial
+from pathlib import Path
+
+from mashumaro.codecs.orjson import ORJSONDecoder
+
+from powerfox import LocalResponse
+from powerfox.decoders import decode_local_sample
+
+FIXTURE = Path(__file__).parents[1] / "tests" / "fixtures" / "local_value.json"
+
+
+def _per_call(func: partial[object], number: int) -> float:
+    """Return the best per-call time in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main(number: int = 20_000) -> None:
+    """Print the per-sample decode cost of both paths."""
+    payload = FIXTURE.read_bytes()
+    decoder = ORJSONDecoder(LocalResponse)
+    before = _per_call(partial(decoder.decode, payload), number)
+    after = _per_call(partial(decode_local_sample, payload), number)
+    print(f"{'ORJSONDecoder(LocalResponse)':<30}{before:>8.2f} us")
+    print(f"{'decode_local_sample':<30}{after:>8.2f} us")
+    print(f"{'speedup':<30}{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
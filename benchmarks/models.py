@@ -0,0 +1,53 @@
+"""Benchmark the memory per ReportValue with and without slots."""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from typing import TYPE_CHECKING, Any
+
+from powerfox import ReportValue
+from powerfox.decoders import data_decoder
+
+from .payloads import report_values
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+COUNT = 10_000
+
+# The same fields in a regular dataclass, like ReportValue before slots.
+UnslottedReportValue = make_dataclass(
+    "UnslottedReportValue",
+    [(item.name, item.type) for item in fields(ReportValue) if item.init],
+)
+
+
+def _allocated(build: Callable[[], Any]) -> int:
+    """Return the bytes still allocated by the result of `build`."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main(count: int = COUNT) -> None:
+    """Print the bytes per report value of both classes."""
+    values = data_decoder(list[ReportValue]).decode(report_values(count))
+    kwargs = [
+        {item.name: getattr(value, item.name) for item in fields(value) if item.init}
+        for value in values
+    ]
+    before = _allocated(lambda: [UnslottedReportValue(**kw) for kw in kwargs])
+    after = _allocated(lambda: [ReportValue(**kw) for kw in kwargs])
+    print(f"{'class':<22}{'bytes per value':>16}")
+    print(f"{'without slots':<22}{before / count:>16.0f}")
+    print(f"{'ReportValue (slots)':<22}{after / count:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Synthetic Powerfox payloads for the benchmarks."""
+
+from __future__ import annotations
+
+from typing import Any
+
+HOUR = 3600
+START = 1704067200  # 2024-01-01T00:00:00Z
+
+
+def report_values(count: int, *, values_type: int = 1) -> list[dict[str, Any]]:
+    """Return `count` hourly ReportValues entries."""
+    return [
+        {
+            "DeviceId": "9x9x1f12xx6x",
+            "Timestamp": START + index * HOUR,
+            "Complete": True,
+            "Delta": 0.009,
+            "DeltaHT": 0.009,
+            "DeltaNT": 0,
+            "DeltaCurrency": 0.005298172043010753,
+            "ValuesType": values_type,
+        }
+        for index in range(count)
+    ]
+
+
+def report_payload(count: int) -> dict[str, Any]:
+    """Return a power meter report with `count` values per section."""
+    return {
+        "Consumption": {
+            "StartTime": START,
+            "StartTimeCurrency": START,
+            "Sum": 0.009 * count,
+            "Max": 0.013,
+            "MaxCurrency": 0.006458172043010753,
+            "MeterReadings": [],
+            "ReportValues": report_values(count),
+            "SumCurrency": 0.005298172043010753 * count,
+        },
+        "FeedIn": {
+            "StartTime": START,
+            "StartTimeCurrency": START,
+            "Sum": 0,
+            "Max": 0,
+            "MaxCurrency": 0,
+            "MeterReadings": [],
+            "ReportValues": report_values(count, values_type=2),
+            "SumCurrency": 0,
+        },
+    }
+
+
+def devices_payload(count: int) -> list[dict[str, Any]]:
+    """Return a device list with `count` power meters."""
+    return [
+        {
+            "DeviceId": f"{index:012x}",
+            "Name": f"Poweropti {index}",
+            "AccountAssociatedSince": 1664702555,
+            "MainDevice": index == 0,
+            "Prosumer": True,
+            "Division": 0,
+        }
+        for index in range(count)
+    ]
+
+
+def error_envelope(status_code: int = 412) -> dict[str, Any]:
+    """Return an API error envelope as sent inside a HTTP 200 response."""
+    return {
+        "Version": "1.1",
+        "Content": {
+            "Headers": [{"Key": "Content-Type", "Value": ["text/plain; charset=utf-8"]}]
+        },
+        "StatusCode": status_code,
+        "ReasonPhrase": "Precondition Failed",
+        "Headers": [],
+        "TrailingHeaders": [],
+    }
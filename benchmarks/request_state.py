@@ -0,0 +1,57 @@
+"""Benchmark the per-request overhead of building the request state.
+
+Compares rebuilding the URL, headers and basic auth credentials on every
+request, as the clients used to, with the state precomputed per client.
+"""
+
+from __future__ import annotations
+
+import timeit
+from typing import Any
+
+from aiohttp import BasicAuth
+from yarl import URL
+
+from powerfox import Powerfox
+from powerfox.powerfox import API_URL, VERSION, _api_url
+
+URI = "my/9x9x1f12xx6x/current"
+
+
+def _rebuild() -> tuple[URL, dict[str, str]]:
+    """Build the request state the way the client did before."""
+    url = URL.build(
+        scheme="https",
+        host="backend.powerfox.energy",
+        path="/api/2.0/",
+    ).join(URL(URI))
+    headers = {
+        "Accept": "application/json",
+        "User-Agent": f"PythonPowerfox/{VERSION}",
+        "Authorization": BasicAuth("user", "pass").encode(),
+    }
+    return url, headers
+
+
+def _precomputed(client: Powerfox) -> tuple[URL, Any]:
+    """Look up the request state the way the client does now."""
+    return _api_url(client.base_url, URI), client._headers
+
+
+def main(number: int = 20_000) -> None:
+    """Print the per-request overhead of both implementations."""
+    client = Powerfox(username="user", password="pass")
+    assert _rebuild() == (_api_url(API_URL, URI), dict(client._headers))  # noqa: S101
+
+    before = min(timeit.repeat(_rebuild, number=number, repeat=5)) / number
+    after = (
+        min(timeit.repeat(lambda: _precomputed(client), number=number, repeat=5))
+        / number
+    )
+    print(f"{'rebuild per request':<24}{before * 1e6:>9.2f} us")
+    print(f"{'precomputed':<24}{after * 1e6:>9.2f} us")
+    print(f"{'speedup':<24}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
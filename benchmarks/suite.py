@@ -0,0 +1,267 @@
+"""Benchmark the client methods against a local stand-in for the APIs.
+
+Starts an aiohttp server on localhost serving synthetic payloads, from a
+single day up to a multi-year report and large device lists, and points
+the clients at it. For every case it records the throughput, latency
+percentiles and peak memory of a call.
+
+Baselines are machine specific. Save one on the main branch and compare
+your changes against it on the same machine:
+
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import socket
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from aiohttp import ClientSession, TCPConnector, web
+from yarl import URL
+
+from powerfox import Powerfox, PowerfoxLocal
+
+from .payloads import devices_payload, report_payload
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Sequence
+
+FIXTURES = Path(__file__).parents[1] / "tests" / "fixtures"
+
+# By default, a regression is reported when the throughput drops more than this.
+TOLERANCE = 0.2
+
+# Number of report values per section of each report size.
+REPORT_SIZES: dict[str, int] = {
+    "day": 24,
+    "month": 24 * 31,
+    "year": 24 * 366,
+    "3 years": 24 * 366 * 3,
+}
+DEVICE_COUNTS: dict[str, int] = {"10": 10, "1000": 1000}
+
+
+@dataclass
+class Result:
+    """Object representing the measurements of a single case."""
+
+    case: str
+    calls: int
+    throughput: float
+    p50: float
+    p90: float
+    p99: float
+    peak_memory: int
+
+
+def _application(state: dict[str, str]) -> web.Application:
+    """Return the stand-in for the cloud and local APIs.
+
+    `state["devices"]` selects the size of the device list that is served.
+    """
+    reports = {
+        name: orjson.dumps(report_payload(count))
+        for name, count in REPORT_SIZES.items()
+    }
+    devices = {
+        name: orjson.dumps(devices_payload(count))
+        for name, count in DEVICE_COUNTS.items()
+    }
+    current = (FIXTURES / "power_meter.json").read_bytes()
+    value = (FIXTURES / "local_value.json").read_bytes()
+
+    def _json(body: bytes) -> web.Response:
+        return web.Response(body=body, content_type="application/json")
+
+    async def _devices(_: web.Request) -> web.Response:
+        return _json(devices[state["devices"]])
+
+    async def _current(_: web.Request) -> web.Response:
+        return _json(current)
+
+    async def _report(request: web.Request) -> web.Response:
+        return _json(reports[request.match_info["device_id"]])
+
+    async def _value(_: web.Request) -> web.Response:
+        return _json(value)
+
+    app = web.Application()
+    app.router.add_get("/api/2.0/my/all/devices", _devices)
+    app.router.add_get("/api/2.0/my/{device_id}/current", _current)
+    app.router.add_get("/api/2.0/my/{device_id}/report", _report)
+    app.router.add_get("/value", _value)
+    return app
+
+
+async def _measure(
+    case: str,
+    call: Callable[[Any], Awaitable[Any]],
+    clients: Sequence[Any],
+    calls: int,
+) -> Result:
+    """Run a call repeatedly, concurrently on every client, and measure it.
+
+    Each worker sends its calls through a client of its own, so identical
+    concurrent calls are not coalesced into a single request. The workers
+    pull from a shared counter until all calls are made.
+    """
+    for client in clients:
+        await call(client)  # Warm up the connections and the decoders.
+
+    latencies: list[float] = []
+    remaining = iter(range(calls))
+
+    async def _worker(client: Any) -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            await call(client)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker(client) for client in clients))
+    elapsed = time.perf_counter() - started
+
+    # Measured separately, tracing slows down the calls themselves.
+    tracemalloc.start()
+    await call(clients[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return Result(
+        case=case,
+        calls=calls,
+        throughput=calls / elapsed,
+        p50=quantiles[49] * 1e3,
+        p90=quantiles[89] * 1e3,
+        p99=quantiles[98] * 1e3,
+        peak_memory=peak,
+    )
+
+
+async def run(calls: int = 200, concurrency: int = 4) -> list[Result]:
+    """Run all cases against a stand-in server on localhost."""
+    state = {"devices": next(iter(DEVICE_COUNTS))}
+    runner = web.AppRunner(_application(state), access_log=None)
+    await runner.setup()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    await web.SockSite(runner, sock).start()
+
+    base_url = URL.build(scheme="http", host="127.0.0.1", port=port)
+    results: list[Result] = []
+    try:
+        async with ClientSession(
+            connector=TCPConnector(limit_per_host=concurrency)
+        ) as session:
+            clients = [
+                Powerfox(
+                    username="user",
+                    password="pass",
+                    session=session,
+                    base_url=base_url / "api/2.0/",
+                )
+                for _ in range(concurrency)
+            ]
+            local = PowerfoxLocal(
+                host="127.0.0.1", api_key="key", session=session, base_url=base_url
+            )
+            for name in DEVICE_COUNTS:
+                state["devices"] = name
+                results.append(
+                    await _measure(
+                        f"all_devices ({name})", Powerfox.all_devices, clients, calls
+                    )
+                )
+            results.append(
+                await _measure(
+                    "device", lambda client: client.device("device"), clients, calls
+                )
+            )
+            for name, count in REPORT_SIZES.items():
+                results.append(
+                    await _measure(
+                        f"report ({name})",
+                        lambda client, name=name: client.report(name, year=2024),
+                        clients,
+                        max(5, calls * 24 // count),
+                    )
+                )
+            results.append(
+                await _measure("local value", PowerfoxLocal.value, [local], calls)
+            )
+    finally:
+        await runner.cleanup()
+    return results
+
+
+def _print(
+    results: list[Result],
+    baseline: dict[str, Any] | None,
+    tolerance: float,
+) -> bool:
+    """Print the results, returning False if any case regressed."""
+    print(
+        f"{'case':<22}{'calls/s':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+        f"{'peak KiB':>10}{'vs base':>9}"
+    )
+    ok = True
+    for result in results:
+        change = ""
+        if baseline and (base := baseline.get(result.case)):
+            ratio = result.throughput / base["throughput"]
+            change = f"{ratio - 1:+.0%}"
+            if ratio < 1 - tolerance:
+                change += " !"
+                ok = False
+        print(
+            f"{result.case:<22}{result.throughput:>10.0f}{result.p50:>9.2f}"
+            f"{result.p90:>9.2f}{result.p99:>9.2f}"
+            f"{result.peak_memory / 1024:>10.0f}{change:>9}"
+        )
+    return ok
+
+
+def main() -> None:
+    """Run the suite, optionally saving or comparing against a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--save", type=Path, help="write the results as baseline")
+    parser.add_argument("--compare", type=Path, help="compare with a baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=TOLERANCE,
+        help="allowed drop in throughput, as a fraction",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.calls, args.concurrency))
+    baseline = orjson.loads(args.compare.read_bytes()) if args.compare else None
+    ok = _print(results, baseline, args.tolerance)
+    if args.save:
+        args.save.write_bytes(
+            orjson.dumps(
+                {result.case: asdict(result) for result in results},
+                option=orjson.OPT_INDENT_2,
+            )
+        )
+    if not ok:
+        print(f"Throughput dropped more than {args.tolerance:.0%} (marked with !).")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""Asynchronous Python client for Powerfox."""
+
+import asyncio
+
+from powerfox import Powerfox, PowerfoxError
+
+
+async def main() -> None:
+    """Show example on getting realtime data for all devices at once."""
+    async with Powerfox(username="EMAIL_ADDRESS", password="PASSWORD") as client:
+        results = await client.all_current(concurrency=5)
+        for device_id, result in results.items():
+            if isinstance(result, PowerfoxError):
+                print(f"{device_id}: failed with {result!r}")
+            else:
+                print(f"{device_id}: {result}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,24 @@
+"""Example for fetching reports over a date range."""
+
+import asyncio
+from datetime import date
+
+from powerfox import Powerfox, ReportGranularity
+
+
+async def main() -> None:
+    """Show example on backfilling daily report data."""
+    async with Powerfox(username="EMAIL_ADDRESS", password="PASSWORD") as client:
+        async for period in client.report_range(
+            "DEVICE_ID",
+            start=date(2024, 1, 1),
+            end=date(2024, 12, 31),
+            granularity=ReportGranularity.DAY,
+            concurrency=4,
+        ):
+            consumption = period.report.consumption
+            print(period.start, consumption.sum if consumption else None)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,14 +1,22 @@
 """Asynchronous Python client for Powerfox."""
 
+from .cache import ResponseCache
+from .columnar import ColumnarReport, ReportColumns
 from .exceptions import (
     PowerfoxAuthenticationError,
+    PowerfoxCircuitOpenError,
     PowerfoxConnectionError,
     PowerfoxError,
     PowerfoxNoDataError,
     PowerfoxPrivacyError,
+    PowerfoxRateLimitError,
     PowerfoxUnsupportedDeviceError,
 )
+from .fleet import FleetReading, PowerfoxLocalFleet
+from .history import ReportGranularity, ReportPeriod
+from .instrumentation import DecodeTiming, Instrumentation, RequestTiming
 from .local import PowerfoxLocal
+from .metrics import Histogram, Metrics
 from .models import (
     Device,
     DeviceReport,
@@ -17,31 +25,62 @@ from .models import (
     GasReport,
     HeatMeter,
     LocalResponse,
+    LocalSample,
     PowerMeter,
     Poweropti,
     ReportValue,
     WaterMeter,
 )
 from .powerfox import Powerfox
+from .ratelimit import RateLimiter
+from .reportcache import ReportCache
+from .resilience import CircuitBreaker, CircuitState, RetryPolicy
+from .rolling import LocalSampleBuffer
+from .sampling import SamplerStats
+from .sync import ReportSync, ReportSyncResult
 
 __all__ = [
+    "CircuitBreaker",
+    "CircuitState",
+    "ColumnarReport",
+    "DecodeTiming",
     "Device",
     "DeviceReport",
     "DeviceType",
     "EnergyReport",
+    "FleetReading",
     "GasReport",
     "HeatMeter",
+    "Histogram",
+    "Instrumentation",
     "LocalResponse",
+    "LocalSample",
+    "LocalSampleBuffer",
+    "Metrics",
     "PowerMeter",
     "Powerfox",
     "PowerfoxAuthenticationError",
+    "PowerfoxCircuitOpenError",
     "PowerfoxConnectionError",
     "PowerfoxError",
     "PowerfoxLocal",
+    "PowerfoxLocalFleet",
     "PowerfoxNoDataError",
     "PowerfoxPrivacyError",
+    "PowerfoxRateLimitError",
     "PowerfoxUnsupportedDeviceError",
     "Poweropti",
+    "RateLimiter",
+    "ReportCache",
+    "ReportColumns",
+    "ReportGranularity",
+    "ReportPeriod",
+    "ReportSync",
+    "ReportSyncResult",
     "ReportValue",
+    "RequestTiming",
+    "ResponseCache",
+    "RetryPolicy",
+    "SamplerStats",
     "WaterMeter",
 ]
@@ -0,0 +1,80 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class ResponseCache:
+    """In-memory LRU cache for realtime Poweropti readings.
+
+    A reading stays fresh until `ttl` seconds after its measurement
+    `Timestamp`, which is when the next reading is expected. Readings that
+    are already older than that (for example, from an outdated device) are
+    kept for `ttl` seconds after they were fetched instead.
+    """
+
+    ttl: float = 5.0
+    max_size: int = 256
+
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+
+    _entries: OrderedDict[str, tuple[float, dict[str, Any]]] = field(
+        default_factory=OrderedDict, init=False, repr=False, compare=False
+    )
+
+    def __len__(self) -> int:
+        """Return the number of cached readings."""
+        return len(self._entries)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return a fresh cached reading.
+
+        Args:
+        ----
+            key: The cache key, for example, the request URI.
+
+        Returns:
+        -------
+            The cached reading, or None if it is missing or expired.
+
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, data: dict[str, Any]) -> None:
+        """Store a reading, evicting the least recently used one if full.
+
+        Args:
+        ----
+            key: The cache key, for example, the request URI.
+            data: The parsed reading, including its `Timestamp`.
+
+        """
+        age = 0.0
+        if isinstance(timestamp := data.get("Timestamp"), int | float):
+            age = max(0.0, time.time() - timestamp)
+        lifetime = self.ttl - age if age < self.ttl else self.ttl
+
+        self._entries[key] = (time.monotonic() + lifetime, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached readings and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
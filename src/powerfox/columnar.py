@@ -0,0 +1,255 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Any, overload
+
+from .decoders import data_decoder
+from .models import DeviceReport, ReportValue
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+# Optional float fields of ReportValue, stored as float64 columns.
+FLOAT_COLUMNS: tuple[str, ...] = (
+    "delta",
+    "delta_ht",
+    "delta_nt",
+    "delta_currency",
+    "total_delta",
+    "total_delta_currency",
+    "consumption",
+    "consumption_kwh",
+    "current_consumption",
+    "current_consumption_kwh",
+)
+
+_ALIASES: dict[str, str] = {
+    report_field.name: report_field.metadata["alias"]
+    for report_field in fields(ReportValue)
+}
+
+# Sections of DeviceReport holding report values, by alias.
+_SECTIONS: dict[str, str] = {
+    report_field.name: report_field.metadata["alias"]
+    for report_field in fields(DeviceReport)
+}
+
+_MISSING_VALUES_TYPE = -1
+
+
+def _to_float(value: float | None) -> float:
+    """Return the column value for an optional float."""
+    return math.nan if value is None else value
+
+
+def _from_float(value: float) -> float | None:
+    """Return the optional float for a column value."""
+    return None if math.isnan(value) else value
+
+
+class ReportColumns(Sequence[ReportValue]):
+    """Columnar, array-backed series of report values.
+
+    Stores the timestamps as int64 epoch seconds and the optional float
+    fields as float64 columns, with NaN for missing values. This takes a
+    fraction of the memory of a list of ReportValue objects. Indexing or
+    iterating builds the ReportValue objects on the fly.
+    """
+
+    __slots__ = (
+        "_device_ids",
+        "_device_index",
+        "complete",
+        "floats",
+        "timestamps",
+        "values_type",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an empty series."""
+        self.timestamps: array[int] = array("q")
+        self.complete: array[int] = array("b")
+        self.values_type: array[int] = array("b")
+        self.floats: dict[str, array[float]] = {
+            name: array("d") for name in FLOAT_COLUMNS
+        }
+        # Device IDs repeat on every row, store each one only once.
+        self._device_ids: list[str] = []
+        self._device_index: array[int] = array("I")
+
+    def _append_device(self, device_id: str) -> None:
+        """Append the device ID of a row."""
+        if not self._device_ids or self._device_ids[-1] != device_id:
+            try:
+                index = self._device_ids.index(device_id)
+            except ValueError:
+                index = len(self._device_ids)
+                self._device_ids.append(device_id)
+        else:
+            index = len(self._device_ids) - 1
+        self._device_index.append(index)
+
+    def append(self, value: ReportValue) -> None:
+        """Append a report value to the series.
+
+        Args:
+        ----
+            value: The report value to append.
+
+        """
+        self._append_device(value.device_id)
+        self.timestamps.append(value.timestamp_epoch)
+        self.complete.append(value.complete)
+        self.values_type.append(
+            _MISSING_VALUES_TYPE if value.values_type is None else value.values_type
+        )
+        for name, column in self.floats.items():
+            column.append(_to_float(getattr(value, name)))
+
+    def append_raw(self, value: Mapping[str, Any]) -> None:
+        """Append a report value straight from the API response.
+
+        Args:
+        ----
+            value: A single `ReportValues` entry of the API response.
+
+        """
+        self._append_device(value[_ALIASES["device_id"]])
+        self.timestamps.append(value[_ALIASES["timestamp"]])
+        self.complete.append(value[_ALIASES["complete"]])
+        values_type = value.get(_ALIASES["values_type"])
+        self.values_type.append(
+            _MISSING_VALUES_TYPE if values_type is None else values_type
+        )
+        for name, column in self.floats.items():
+            column.append(_to_float(value.get(_ALIASES[name])))
+
+    @classmethod
+    def from_report_values(cls, values: Iterable[ReportValue]) -> ReportColumns:
+        """Create a series from report values.
+
+        Args:
+        ----
+            values: The report values, for example, `report.report_values`.
+
+        Returns:
+        -------
+            The columnar series.
+
+        """
+        columns = cls()
+        for value in values:
+            columns.append(value)
+        return columns
+
+    @classmethod
+    def from_raw(cls, values: Iterable[Mapping[str, Any]]) -> ReportColumns:
+        """Create a series from the `ReportValues` of an API response.
+
+        No ReportValue objects are created along the way.
+
+        Args:
+        ----
+            values: The `ReportValues` entries of the API response.
+
+        Returns:
+        -------
+            The columnar series.
+
+        """
+        columns = cls()
+        for value in values:
+            columns.append_raw(value)
+        return columns
+
+    def __len__(self) -> int:
+        """Return the number of report values."""
+        return len(self.timestamps)
+
+    @overload
+    def __getitem__(self, index: int) -> ReportValue: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ReportValue]: ...
+
+    def __getitem__(self, index: int | slice) -> ReportValue | list[ReportValue]:
+        """Build the report value(s) at an index or slice."""
+        if isinstance(index, slice):
+            return [self._value(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            msg = "ReportColumns index out of range"
+            raise IndexError(msg)
+        return self._value(index)
+
+    def __iter__(self) -> Iterator[ReportValue]:
+        """Iterate over the report values, building them one at a time."""
+        return map(self._value, range(len(self)))
+
+    def __repr__(self) -> str:
+        """Return a short representation of the series."""
+        return f"ReportColumns(len={len(self)})"
+
+    def _value(self, index: int) -> ReportValue:
+        """Build the report value at a valid index."""
+        values_type = self.values_type[index]
+        return ReportValue(
+            device_id=self._device_ids[self._device_index[index]],
+            # Kept as epoch seconds until the timestamp is read.
+            timestamp=self.timestamps[index],  # ty:ignore[invalid-argument-type]
+            complete=bool(self.complete[index]),
+            values_type=None if values_type == _MISSING_VALUES_TYPE else values_type,
+            **{
+                name: _from_float(column[index]) for name, column in self.floats.items()
+            },
+        )
+
+    def to_report_values(self) -> list[ReportValue]:
+        """Return all report values as a list of ReportValue objects."""
+        return list(self)
+
+
+@dataclass
+class ColumnarReport:
+    """Object representing a report with its values stored in columns.
+
+    The sections of `report` hold the totals only, their report values are
+    available in the column series of the same name.
+    """
+
+    report: DeviceReport
+    gas: ReportColumns | None = None
+    consumption: ReportColumns | None = None
+    feed_in: ReportColumns | None = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> ColumnarReport:
+        """Create a columnar report from the parsed API response.
+
+        Args:
+        ----
+            data: The parsed report response.
+
+        Returns:
+        -------
+            The columnar report.
+
+        """
+        sections: dict[str, Any] = {}
+        columns: dict[str, ReportColumns] = {}
+        for name, alias in _SECTIONS.items():
+            if not isinstance(section := data.get(alias), dict):
+                continue
+            values = section.get("ReportValues") or ()
+            columns[name] = ReportColumns.from_raw(values)
+            sections[alias] = {
+                key: value for key, value in section.items() if key != "ReportValues"
+            }
+        report = data_decoder(DeviceReport).decode({**data, **sections})
+        return cls(report, **columns)
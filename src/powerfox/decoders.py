@@ -0,0 +1,109 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+from functools import cache
+from typing import Any
+
+import orjson
+from mashumaro.codecs.basic import BasicDecoder
+from mashumaro.codecs.orjson import ORJSONDecoder
+
+from .exceptions import PowerfoxError
+from .models import (
+    LOCAL_OBIS_FIELDS,
+    HeatMeter,
+    LocalSample,
+    PowerMeter,
+    WaterMeter,
+)
+
+# Poweropti payloads carry no explicit type field, the matching subclass is
+# picked by trying each variant in turn. The variants are listed explicitly,
+# as dataclass(slots=True) leaves the replaced classes behind as subclasses.
+PowerOptiVariant = PowerMeter | HeatMeter | WaterMeter
+
+
+@cache
+def json_decoder(shape: Any) -> ORJSONDecoder[Any]:
+    """Return the shared ORJSON decoder for a type.
+
+    Building a decoder compiles a dedicated decode function, which is far
+    more expensive than the decoding itself. Decoders are therefore built
+    lazily on first use and shared by all clients afterwards.
+
+    Args:
+    ----
+        shape: The type to decode into, for example, `list[Device]`.
+
+    Returns:
+    -------
+        The decoder for the requested type.
+
+    """
+    return ORJSONDecoder(shape)
+
+
+@cache
+def data_decoder(shape: Any) -> BasicDecoder[Any]:
+    """Return the shared decoder for already parsed JSON data.
+
+    Use this instead of `json_decoder` when the payload has been parsed
+    once already, for example, to check whether it is empty, so the text
+    does not need to be parsed a second time.
+
+    Args:
+    ----
+        shape: The type to decode into, for example, `DeviceReport`.
+
+    Returns:
+    -------
+        The decoder for the requested type.
+
+    """
+    return BasicDecoder(shape)
+
+
+# Position in LocalSample of the value of each OBIS code.
+_LOCAL_SAMPLE_INDEX: dict[str, int] = {
+    obis: LocalSample._fields.index(name) for obis, name in LOCAL_OBIS_FIELDS.items()
+}
+_LOCAL_SAMPLE_VALUES = (None,) * (len(LocalSample._fields) - 1)
+
+
+def decode_local_sample(payload: bytes | str) -> LocalSample:
+    """Decode a response of the local interface into a LocalSample.
+
+    A fast path for sampling at a high rate: the values are copied straight
+    from the parsed payload into the tuple, skipping the dataclass machinery
+    of LocalResponse. The values are only checked to be integers. Unknown
+    OBIS codes are ignored.
+
+    Args:
+    ----
+        payload: The raw (JSON encoded) response of the `value` endpoint.
+
+    Returns:
+    -------
+        The decoded sample.
+
+    Raises:
+    ------
+        PowerfoxError: The payload is not a valid local interface response.
+
+    """
+    try:
+        data = orjson.loads(payload)
+        row: list[Any] = [data["timestamp"], *_LOCAL_SAMPLE_VALUES]
+        for item in data.get("values") or ():
+            if (index := _LOCAL_SAMPLE_INDEX.get(item.get("obis"))) is not None:
+                row[index] = item.get("value")
+    except (AttributeError, KeyError, TypeError, ValueError) as exception:
+        msg = "Unexpected response from local poweropti."
+        raise PowerfoxError(msg) from exception
+    if not isinstance(row[0], int) or not all(
+        value is None or isinstance(value, int) for value in row[1:]
+    ):
+        msg = "Unexpected response from local poweropti."
+        raise PowerfoxError(msg)
+    return LocalSample._make(row)
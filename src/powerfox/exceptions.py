@@ -9,6 +9,27 @@ class PowerfoxConnectionError(PowerfoxError):
     """Powerfox connection exception."""
 
 
+class PowerfoxRateLimitError(PowerfoxConnectionError):
+    """Powerfox rate limit exception.
+
+    Raised when the API rejected the request with HTTP 429. The delay the
+    API asked for, if any, is available as `retry_after` (in seconds).
+    """
+
+    def __init__(self, *args: object, retry_after: float | None = None) -> None:
+        """Initialize the exception."""
+        super().__init__(*args)
+        self.retry_after = retry_after
+
+
+class PowerfoxCircuitOpenError(PowerfoxConnectionError):
+    """Powerfox circuit open exception.
+
+    Raised without sending the request while the circuit breaker considers
+    the API or device to be down.
+    """
+
+
 class PowerfoxAuthenticationError(PowerfoxError):
     """Powerfox authentication exception."""
 
@@ -0,0 +1,181 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Self
+
+from aiohttp import ClientSession, TCPConnector
+
+from .exceptions import PowerfoxError
+from .local import PowerfoxLocal
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from .instrumentation import Instrumentation
+    from .models import LocalResponse
+
+
+@dataclass
+class FleetReading:
+    """Object representing the result of polling one poweropti of a fleet."""
+
+    host: str
+    result: LocalResponse | PowerfoxError
+
+
+@dataclass
+class PowerfoxLocalFleet:
+    """Poller for many local poweroptis sharing one connection pool.
+
+    Every poweropti is polled on its own drift-free schedule, with the
+    schedules spread evenly over the interval so the requests do not all
+    go out at once. Each request is limited by `request_timeout`, so a slow
+    or dead poweropti only delays its own readings.
+    """
+
+    devices: list[tuple[str, str]]
+
+    interval: float = 5.0
+    request_timeout: float = 5.0
+    session: ClientSession | None = None
+    instrumentation: Instrumentation | None = None
+
+    # Connection pool of the session created when none is passed in.
+    connection_limit: int = 100
+    connection_limit_per_host: int = 1
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int = 300
+
+    _close_session: bool = False
+    _clients: list[PowerfoxLocal] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+
+    def _ensure_session(self) -> ClientSession:
+        """Return the client session, creating a pooled one if needed."""
+        if self.session is None:
+            self.session = ClientSession(
+                connector=TCPConnector(
+                    limit=self.connection_limit,
+                    limit_per_host=self.connection_limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                ),
+                trace_configs=(
+                    [self.instrumentation.trace_config()]
+                    if self.instrumentation is not None
+                    else None
+                ),
+            )
+            self._close_session = True
+        return self.session
+
+    def _ensure_clients(self) -> list[PowerfoxLocal]:
+        """Return a client per poweropti, all sharing the session."""
+        if not self._clients:
+            session = self._ensure_session()
+            self._clients = [
+                PowerfoxLocal(
+                    host=host,
+                    api_key=api_key,
+                    request_timeout=self.request_timeout,
+                    session=session,
+                    instrumentation=self.instrumentation,
+                )
+                for host, api_key in self.devices
+            ]
+        return self._clients
+
+    async def _poll_device(
+        self,
+        client: PowerfoxLocal,
+        offset: float,
+        readings: asyncio.Queue[FleetReading],
+    ) -> None:
+        """Poll a single poweropti until cancelled."""
+        loop = asyncio.get_running_loop()
+        tick = loop.time() + offset
+        while True:
+            if (delay := tick - loop.time()) > 0:
+                await asyncio.sleep(delay)
+            result: LocalResponse | PowerfoxError
+            try:
+                result = await client.value()
+            except PowerfoxError as err:
+                result = err
+            await readings.put(FleetReading(client.host, result))
+
+            tick += self.interval
+            now = loop.time()
+            if now >= tick + self.interval:
+                # Skip the missed ticks instead of polling in a burst.
+                tick += math.floor((now - tick) / self.interval) * self.interval
+
+    async def poll(self) -> AsyncGenerator[FleetReading]:
+        """Poll all poweroptis until the consumer stops iterating.
+
+        Yields
+        ------
+            The reading or error of each poll, tagged by host, in the order
+            they arrive.
+
+        Raises
+        ------
+            ValueError: If there are no devices, or the interval is not
+                positive.
+
+        """
+        if not self.devices:
+            msg = "Parameter 'devices' must not be empty."
+            raise ValueError(msg)
+        if self.interval <= 0:
+            msg = "Parameter 'interval' must be positive."
+            raise ValueError(msg)
+
+        clients = self._ensure_clients()
+        # A slow consumer makes the pollers wait, which skips their ticks.
+        readings: asyncio.Queue[FleetReading] = asyncio.Queue(maxsize=len(clients))
+        tasks = [
+            asyncio.create_task(
+                self._poll_device(
+                    client, self.interval * index / len(clients), readings
+                )
+            )
+            for index, client in enumerate(clients)
+        ]
+        try:
+            while True:
+                yield await readings.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Close open client session."""
+        if self.session and self._close_session:
+            await self.session.close()
+
+    async def __aenter__(self) -> Self:
+        """Async enter.
+
+        Returns
+        -------
+            The PowerfoxLocalFleet object.
+
+        """
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Async exit.
+
+        Args:
+        ----
+            _exc_info: Exec type.
+
+        """
+        await self.close()
@@ -0,0 +1,77 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .models import DeviceReport
+
+
+class ReportGranularity(StrEnum):
+    """Enum for the period covered by a single report request."""
+
+    YEAR = "year"
+    MONTH = "month"
+    DAY = "day"
+
+    def params(self, period: date) -> dict[str, int]:
+        """Return the report filters selecting the period starting at `period`."""
+        match self:
+            case ReportGranularity.YEAR:
+                return {"year": period.year}
+            case ReportGranularity.MONTH:
+                return {"year": period.year, "month": period.month}
+            case _:
+                return {"year": period.year, "month": period.month, "day": period.day}
+
+
+@dataclass
+class ReportPeriod:
+    """Object representing the report of a single period in a range."""
+
+    start: date
+    granularity: ReportGranularity
+    report: DeviceReport
+
+
+def plan_report_periods(
+    start: date,
+    end: date,
+    granularity: ReportGranularity,
+) -> Iterator[date]:
+    """Yield the first day of every period overlapping a date range.
+
+    Args:
+    ----
+        start: First day of the range.
+        end: Last day of the range (inclusive).
+        granularity: Length of the periods.
+
+    Yields:
+    ------
+        The first day of each period, in order.
+
+    """
+    match granularity:
+        case ReportGranularity.YEAR:
+            for year in range(start.year, end.year + 1):
+                yield date(year, 1, 1)
+        case ReportGranularity.MONTH:
+            for index in range(
+                start.year * 12 + start.month - 1,
+                end.year * 12 + end.month,
+            ):
+                yield date(index // 12, index % 12 + 1, 1)
+        case _:
+            # Drop the time, in case datetime objects were passed in.
+            day = date(start.year, start.month, start.day)
+            last = date(end.year, end.month, end.day)
+            while day <= last:
+                yield day
+                day += timedelta(days=1)
@@ -0,0 +1,347 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any, Self
+
+from aiohttp import TraceConfig
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from contextlib import AbstractContextManager
+    from types import SimpleNamespace, TracebackType
+
+    from aiohttp import ClientSession
+
+    from .exceptions import PowerfoxError
+
+# Shared by every untimed step, so disabled instrumentation allocates nothing.
+DISABLED: nullcontext[None] = nullcontext()
+
+# Signals of aiohttp traces and the mark of RequestTrace each one sets.
+_TRACE_MARKS: dict[str, str] = {
+    "on_connection_queued_start": "_queue_start",
+    "on_connection_queued_end": "_queue_end",
+    "on_dns_resolvehost_start": "_dns_start",
+    "on_dns_resolvehost_end": "_dns_end",
+    "on_connection_create_start": "_connect_start",
+    "on_connection_create_end": "_connect_end",
+    "on_connection_reuseconn": "_reused",
+    "on_request_headers_sent": "_sent",
+}
+
+
+@dataclass(slots=True, frozen=True)
+class RequestTiming:
+    """Object representing the timings of a single HTTP request.
+
+    Durations are in seconds. The network phases are None when they did not
+    happen, for example, `dns` and `connect` on a reused connection, or when
+    the session was created without `Instrumentation.trace_config()`. A
+    request that was cancelled, for example, because its callers left, is
+    marked `cancelled` instead of having an `error`.
+    """
+
+    method: str
+    host: str
+    endpoint: str
+    status: int | None
+    size: int | None
+    total: float
+    queued: float | None = None
+    dns: float | None = None
+    connect: float | None = None
+    wait: float | None = None
+    read: float | None = None
+    reused: bool | None = None
+    error: str | None = None
+    cancelled: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class DecodeTiming:
+    """Object representing the time spent decoding a response."""
+
+    operation: str
+    duration: float
+
+
+class RequestTrace:
+    """Timing of a request in progress, reported when the block exits.
+
+    The aiohttp trace signals set the marks of the network phases, the
+    client marks the response headers and body.
+    """
+
+    __slots__ = (
+        "_body",
+        "_connect_end",
+        "_connect_start",
+        "_dns_end",
+        "_dns_start",
+        "_headers",
+        "_queue_end",
+        "_queue_start",
+        "_reused",
+        "_sent",
+        "_started",
+        "endpoint",
+        "host",
+        "instrumentation",
+        "method",
+        "size",
+        "status",
+    )
+
+    def __init__(
+        self,
+        instrumentation: Instrumentation,
+        method: str,
+        host: str,
+        endpoint: str,
+    ) -> None:
+        """Initialize a trace without any marks."""
+        self.instrumentation = instrumentation
+        self.method = method
+        self.host = host
+        self.endpoint = endpoint
+        self.status: int | None = None
+        self.size: int | None = None
+        self._started = 0.0
+        self._queue_start: float | None = None
+        self._queue_end: float | None = None
+        self._dns_start: float | None = None
+        self._dns_end: float | None = None
+        self._connect_start: float | None = None
+        self._connect_end: float | None = None
+        self._reused: float | None = None
+        self._sent: float | None = None
+        self._headers: float | None = None
+        self._body: float | None = None
+
+    def received(self, status: int) -> None:
+        """Mark the arrival of the response headers."""
+        self._headers = time.perf_counter()
+        self.status = status
+
+    def read(self, size: int) -> None:
+        """Mark the end of reading the response body."""
+        self._body = time.perf_counter()
+        self.size = size
+
+    def __enter__(self) -> Self:
+        """Start timing the request."""
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Report the timing of the request, also when it failed."""
+        total = time.perf_counter() - self._started
+        dns = _between(self._dns_start, self._dns_end)
+        connect = _between(self._connect_start, self._connect_end)
+        if connect is not None and dns is not None:
+            # Resolving the host is part of creating the connection.
+            connect -= dns
+        reused: bool | None = None
+        if self._reused is not None or self._connect_end is not None:
+            reused = self._reused is not None
+        cancelled = exc_type is not None and issubclass(
+            exc_type, asyncio.CancelledError
+        )
+        self.instrumentation.report_request(
+            RequestTiming(
+                method=self.method,
+                host=self.host,
+                endpoint=self.endpoint,
+                status=self.status,
+                size=self.size,
+                total=total,
+                queued=_between(self._queue_start, self._queue_end),
+                dns=dns,
+                connect=connect,
+                wait=_between(self._sent, self._headers),
+                read=_between(self._headers, self._body),
+                reused=reused,
+                error=None if exc_type is None or cancelled else exc_type.__name__,
+                cancelled=cancelled,
+            )
+        )
+
+
+class DecodeTimer:
+    """Timing of a decode step, reported when the block exits."""
+
+    __slots__ = ("_started", "instrumentation", "operation")
+
+    def __init__(self, instrumentation: Instrumentation, operation: str) -> None:
+        """Initialize the timer."""
+        self.instrumentation = instrumentation
+        self.operation = operation
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        """Start timing the decode step."""
+        self._started = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Report the time spent decoding."""
+        self.instrumentation.report_decode(
+            DecodeTiming(self.operation, time.perf_counter() - self._started)
+        )
+
+
+def _between(start: float | None, end: float | None) -> float | None:
+    """Return the time between two marks, if both were set."""
+    if start is None or end is None:
+        return None
+    return end - start
+
+
+async def _mark(
+    name: str,
+    _session: ClientSession,
+    context: SimpleNamespace,
+    _params: Any,
+) -> None:
+    """Set a mark on the trace of the request, if it is being traced."""
+    if isinstance(trace := context.trace_request_ctx, RequestTrace):
+        setattr(trace, name, time.perf_counter())
+
+
+@dataclass
+class Instrumentation:
+    """Hooks receiving the timings of the requests made by a client.
+
+    Pass it to Powerfox or PowerfoxLocal to get a RequestTiming for every
+    HTTP request, including each attempt of a retried request, and a
+    DecodeTiming for every decoded response. Errors raised outside of a
+    request, like an empty or unsupported response after it arrived, or
+    PowerfoxCircuitOpenError before it is sent, are passed to `on_error`
+    with their endpoint. Without instrumentation the clients skip all of
+    this.
+
+    The network phases are measured with aiohttp tracing, which is set up
+    on the session the client creates. When passing in your own session,
+    create it with `trace_configs=[instrumentation.trace_config()]`.
+    """
+
+    on_request: Callable[[RequestTiming], None] | None = None
+    on_decode: Callable[[DecodeTiming], None] | None = None
+    on_error: Callable[[str, PowerfoxError], None] | None = None
+
+    def trace_config(self) -> TraceConfig:
+        """Return the aiohttp trace config measuring the network phases.
+
+        Only requests sent by an instrumented client are measured, other
+        requests on the same session are left alone.
+
+        Returns
+        -------
+            A new trace config, to be passed to a ClientSession.
+
+        """
+        config: TraceConfig = TraceConfig()
+        for signal, name in _TRACE_MARKS.items():
+            getattr(config, signal).append(partial(_mark, name))
+        return config
+
+    def request(self, method: str, host: str, endpoint: str) -> RequestTrace:
+        """Return a trace timing a request.
+
+        Args:
+        ----
+            method: HTTP method of the request.
+            host: Host the request is sent to.
+            endpoint: The endpoint, without IDs, for example,
+                'my/{device_id}/current'.
+
+        Returns:
+        -------
+            The trace, to be passed as `trace_request_ctx` to aiohttp.
+
+        """
+        return RequestTrace(self, method, host, endpoint)
+
+    def decoding(self, operation: str) -> DecodeTimer:
+        """Return a timer for decoding a response.
+
+        Args:
+        ----
+            operation: What is decoded, for example, 'device' or 'json'.
+
+        Returns:
+        -------
+            A context manager timing its block.
+
+        """
+        return DecodeTimer(self, operation)
+
+    def report_request(self, timing: RequestTiming) -> None:
+        """Pass the timing of a request to the hook, if any.
+
+        Args:
+        ----
+            timing: The timing of the request.
+
+        """
+        if self.on_request is not None:
+            self.on_request(timing)
+
+    def report_decode(self, timing: DecodeTiming) -> None:
+        """Pass the timing of a decode step to the hook, if any.
+
+        Args:
+        ----
+            timing: The timing of the decode step.
+
+        """
+        if self.on_decode is not None:
+            self.on_decode(timing)
+
+    def report_error(self, endpoint: str, error: PowerfoxError) -> None:
+        """Pass an error raised outside of a request to the hook, if any.
+
+        Args:
+        ----
+            endpoint: The endpoint the error belongs to, without IDs.
+            error: The error raised to the caller.
+
+        """
+        if self.on_error is not None:
+            self.on_error(endpoint, error)
+
+
+def decoding(
+    instrumentation: Instrumentation | None,
+    operation: str,
+) -> AbstractContextManager[None]:
+    """Return a timer for decoding a response, if instrumented.
+
+    Args:
+    ----
+        instrumentation: The instrumentation of the client, if any.
+        operation: What is decoded, for example, 'device' or 'json'.
+
+    Returns:
+    -------
+        A context manager timing its block, or doing nothing.
+
+    """
+    if instrumentation is None:
+        return DISABLED
+    return instrumentation.decoding(operation)
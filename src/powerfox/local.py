@@ -3,22 +3,36 @@
 from __future__ import annotations
 
 import asyncio
+import math
 import socket
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
 from importlib import metadata
-from typing import Any, Self
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Self
 
-from aiohttp import ClientError, ClientResponseError, ClientSession
+from aiohttp import ClientError, ClientResponseError, ClientSession, TCPConnector
 from aiohttp.hdrs import METH_GET
-from mashumaro.codecs.orjson import ORJSONDecoder
 from yarl import URL
 
+from .decoders import decode_local_sample, json_decoder
 from .exceptions import (
     PowerfoxAuthenticationError,
+    PowerfoxCircuitOpenError,
     PowerfoxConnectionError,
     PowerfoxError,
 )
-from .models import LocalResponse
+from .instrumentation import DISABLED, decoding
+from .models import LocalResponse, LocalSample
+from .resilience import send_with_policies
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Mapping
+    from contextlib import AbstractContextManager
+
+    from .instrumentation import Instrumentation, RequestTrace
+    from .resilience import CircuitBreaker, RetryPolicy
+    from .sampling import SamplerStats
 
 VERSION: str = metadata.version(__package__)  # ty:ignore[invalid-argument-type]
 
@@ -36,17 +50,123 @@ class PowerfoxLocal:
 
     request_timeout: float = 10.0
     session: ClientSession | None = None
+    retry_policy: RetryPolicy | None = None
+    circuit_breaker: CircuitBreaker | None = None
+    instrumentation: Instrumentation | None = None
+    base_url: URL | None = None
+
+    # Connection pool of the session created when none is passed in. The
+    # poweropti serves few clients at once, so keep one connection alive.
+    connection_limit: int = 1
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int = 300
 
     _close_session: bool = False
+    _base_url: URL = field(init=False, repr=False, compare=False)
+    _headers: Mapping[str, str] = field(init=False, repr=False, compare=False)
+    _urls: dict[str, URL] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Prepare the URL and headers shared by every request."""
+        self._base_url = self.base_url or URL.build(scheme="http", host=self.host)
+        self._headers = MappingProxyType(
+            {
+                "Accept": "application/json",
+                "User-Agent": f"PythonPowerfox/{VERSION}",
+                "X-API-KEY": self.api_key,
+            }
+        )
+
+    def _url(self, uri: str) -> URL:
+        """Return the absolute URL of an endpoint on the poweropti."""
+        if (url := self._urls.get(uri)) is None:
+            url = self._urls[uri] = self._base_url.join(URL(uri))
+        return url
+
+    def _ensure_session(self) -> ClientSession:
+        """Return the client session, creating a pooled one if needed."""
+        if self.session is None:
+            self.session = ClientSession(
+                connector=TCPConnector(
+                    limit_per_host=self.connection_limit,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                ),
+                trace_configs=(
+                    [self.instrumentation.trace_config()]
+                    if self.instrumentation is not None
+                    else None
+                ),
+            )
+            self._close_session = True
+        return self.session
+
+    def _trace(
+        self,
+        method: str,
+        uri: str,
+    ) -> AbstractContextManager[RequestTrace | None]:
+        """Return a trace timing a request, if instrumented."""
+        if self.instrumentation is None:
+            return DISABLED
+        return self.instrumentation.request(method, self.host, uri)
+
+    def _report_error(self, uri: str, error: PowerfoxError) -> PowerfoxError:
+        """Report an error raised outside of a request, if instrumented.
+
+        Errors of the request itself are part of its RequestTiming.
+
+        Returns
+        -------
+            The error, to be raised.
+
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.report_error(uri, error)
+        return error
 
     async def _request(
         self,
         uri: str,
         *,
         method: str = METH_GET,
-    ) -> Any:
+    ) -> bytes:
         """Handle a request to the local poweropti API.
 
+        Applies the retry policy and circuit breaker, when configured.
+
+        Args:
+        ----
+            uri: Request URI, for example, 'value'.
+            method: HTTP method to use.
+
+        Returns:
+        -------
+            The raw (JSON encoded) response body from the local poweropti API.
+
+        """
+        try:
+            return await send_with_policies(
+                partial(self._send, uri, method=method),
+                retry_policy=self.retry_policy,
+                circuit_breaker=self.circuit_breaker,
+                idempotent=method == METH_GET,
+            )
+        except PowerfoxCircuitOpenError as error:
+            # Raised without sending a request, so without a RequestTiming.
+            self._report_error(uri, error)
+            raise
+
+    async def _send(
+        self,
+        uri: str,
+        *,
+        method: str = METH_GET,
+    ) -> bytes:
+        """Send a single request to the local poweropti API.
+
         Args:
         ----
             uri: Request URI, for example, 'value'.
@@ -54,7 +174,7 @@ class PowerfoxLocal:
 
         Returns:
         -------
-            The response text from the local poweropti API.
+            The raw (JSON encoded) response body from the local poweropti API.
 
         Raises:
         ------
@@ -64,52 +184,46 @@ class PowerfoxLocal:
             PowerfoxError: Received an unexpected response from the API.
 
         """
-        url = URL.build(
-            scheme="http",
-            host=self.host,
-        ).join(URL(uri))
+        session = self._ensure_session()
 
-        headers = {
-            "Accept": "application/json",
-            "User-Agent": f"PythonPowerfox/{VERSION}",
-            "X-API-KEY": self.api_key,
-        }
+        with self._trace(method, uri) as trace:
+            try:
+                async with asyncio.timeout(self.request_timeout):
+                    response = await session.request(
+                        method,
+                        self._url(uri),
+                        headers=self._headers,
+                        trace_request_ctx=trace,
+                    )
+                    if trace is not None:
+                        trace.received(response.status)
+                    response.raise_for_status()
+            except TimeoutError as exception:
+                msg = "Timeout occurred while connecting to local poweropti."
+                raise PowerfoxConnectionError(msg) from exception
+            except ClientResponseError as exception:
+                if exception.status == 401:
+                    msg = "Authentication to local poweropti failed."
+                    raise PowerfoxAuthenticationError(msg) from exception
+                msg = "Error occurred while communicating with local poweropti."
+                raise PowerfoxConnectionError(msg) from exception
+            except (ClientError, socket.gaierror) as exception:
+                msg = "Error occurred while communicating with local poweropti."
+                raise PowerfoxConnectionError(msg) from exception
 
-        if self.session is None:
-            self.session = ClientSession()
-            self._close_session = True
-
-        try:
-            async with asyncio.timeout(self.request_timeout):
-                response = await self.session.request(
-                    method,
-                    url,
-                    headers=headers,
+            content_type = response.headers.get("Content-Type", "")
+            if "application/json" not in content_type:
+                text = await response.text()
+                msg = "Unexpected content type response from local poweropti."
+                raise PowerfoxError(
+                    msg,
+                    {"Content-Type": content_type, "Response": text},
                 )
-                response.raise_for_status()
-        except TimeoutError as exception:
-            msg = "Timeout occurred while connecting to local poweropti."
-            raise PowerfoxConnectionError(msg) from exception
-        except ClientResponseError as exception:
-            if exception.status == 401:
-                msg = "Authentication to local poweropti failed."
-                raise PowerfoxAuthenticationError(msg) from exception
-            msg = "Error occurred while communicating with local poweropti."
-            raise PowerfoxConnectionError(msg) from exception
-        except (ClientError, socket.gaierror) as exception:
-            msg = "Error occurred while communicating with local poweropti."
-            raise PowerfoxConnectionError(msg) from exception
-
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" not in content_type:
-            text = await response.text()
-            msg = "Unexpected content type response from local poweropti."
-            raise PowerfoxError(
-                msg,
-                {"Content-Type": content_type, "Response": text},
-            )
 
-        return await response.text()
+            body = await response.read()
+            if trace is not None:
+                trace.read(len(body))
+            return body
 
     async def value(self) -> LocalResponse:
         """Get current measurement data from the local poweropti.
@@ -118,9 +232,111 @@ class PowerfoxLocal:
         -------
             The current measurement data.
 
+        Raises
+        ------
+            PowerfoxError: The response is not a valid local interface
+                response.
+
         """
-        response = await self._request("value")
-        return ORJSONDecoder(LocalResponse).decode(response)
+        uri = "value"
+        response = await self._request(uri)
+        try:
+            with decoding(self.instrumentation, "value"):
+                return json_decoder(LocalResponse).decode(response)
+        except (AttributeError, LookupError, TypeError, ValueError) as exception:
+            # Invalid JSON, and missing or invalid fields, as mashumaro reports
+            # them with subclasses of these.
+            msg = "Unexpected response from local poweropti."
+            raise self._report_error(uri, PowerfoxError(msg)) from exception
+
+    async def sample(
+        self,
+        interval: float,
+        *,
+        stats: SamplerStats | None = None,
+    ) -> AsyncGenerator[LocalSample]:
+        """Sample the measurement data at a fixed rate.
+
+        Requests are sent on ticks of a monotonic schedule, so the time spent
+        on requests or by the consumer does not make the rate drift. When a
+        request or the consumer takes longer than a full interval, the
+        missed ticks are skipped instead of sent back to back. Each request
+        is sent once, without the retry policy or circuit breaker, as a
+        retry would only delay the next tick. The connection is kept alive
+        between samples, see `keepalive_timeout`, and the responses are
+        decoded by the fast path into compact LocalSample tuples.
+
+        Args:
+        ----
+            interval: Seconds between samples.
+            stats: Optional statistics to update with every sample.
+
+        Yields:
+        ------
+            The measurement data of each sample.
+
+        Raises:
+        ------
+            ValueError: If the interval is not positive.
+
+        """
+        if interval <= 0:
+            msg = "Parameter 'interval' must be positive."
+            raise ValueError(msg)
+
+        loop = asyncio.get_running_loop()
+        tick = loop.time()
+        while True:
+            sent = loop.time()
+            if stats is not None:
+                stats.record(sent, sent - tick)
+            response = await self._send("value")
+            with decoding(self.instrumentation, "sample"):
+                sample = decode_local_sample(response)
+            yield sample
+
+            tick += interval
+            now = loop.time()
+            if now >= tick + interval:
+                missed = math.floor((now - tick) / interval)
+                tick += missed * interval
+                if stats is not None:
+                    stats.skipped += missed
+            if tick > now:
+                await asyncio.sleep(tick - now)
+
+    async def prewarm(self, connections: int = 1) -> None:
+        """Open connections to the local poweropti ahead of the first request.
+
+        Args:
+        ----
+            connections: Number of connections to open, capped by
+                `connection_limit`.
+
+        Raises:
+        ------
+            PowerfoxConnectionError: An error occurred while connecting
+                to the local poweropti.
+
+        """
+        session = self._ensure_session()
+        if self.connection_limit:
+            connections = min(connections, self.connection_limit)
+        url = self._base_url
+
+        async def _open() -> None:
+            async with session.head(url):
+                pass
+
+        try:
+            async with asyncio.timeout(self.request_timeout):
+                await asyncio.gather(*(_open() for _ in range(connections)))
+        except TimeoutError as exception:
+            msg = "Timeout occurred while connecting to local poweropti."
+            raise PowerfoxConnectionError(msg) from exception
+        except (ClientError, socket.gaierror) as exception:
+            msg = "Error occurred while connecting to local poweropti."
+            raise PowerfoxConnectionError(msg) from exception
 
     async def close(self) -> None:
         """Close open client session."""
@@ -0,0 +1,286 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from . import exceptions
+from .instrumentation import Instrumentation
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .exceptions import PowerfoxError
+    from .instrumentation import DecodeTiming, RequestTiming
+
+# Upper bounds of the histogram buckets, in seconds and in bytes.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+DECODE_BUCKETS: tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+)
+SIZE_BUCKETS: tuple[float, ...] = tuple(float(4**power) for power in range(4, 13))
+
+# Names of the exception classes counted as errors of a request.
+_ERRORS: frozenset[str] = frozenset(
+    name
+    for name, value in vars(exceptions).items()
+    if isinstance(value, type) and issubclass(value, exceptions.PowerfoxError)
+)
+
+
+class Histogram:
+    """Histogram counting observations in buckets with fixed upper bounds."""
+
+    __slots__ = ("buckets", "count", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        """Initialize an empty histogram.
+
+        Args:
+        ----
+            buckets: Upper bounds of the buckets, in increasing order.
+
+        """
+        self.buckets = buckets
+        # The last count is for the observations above every bound.
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Count an observation in its bucket.
+
+        Args:
+        ----
+            value: The observed value.
+
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Return the number of observations up to each bound.
+
+        Returns
+        -------
+            Pairs of the upper bound and the count, ending with infinity
+            and the total count.
+
+        """
+        pairs: list[tuple[float, int]] = []
+        total = 0
+        for bound, count in zip(
+            (*self.buckets, float("inf")), self.counts, strict=True
+        ):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+@dataclass
+class Metrics(Instrumentation):
+    """Instrumentation collecting metrics of the requests of the clients.
+
+    Counts the requests per endpoint and the errors per endpoint and
+    exception class, and keeps histograms of the request latency, the
+    response size and the decode time. Pass the same object to several
+    clients to collect their metrics together, and call `export()` to get
+    them in the Prometheus text format. The `on_request`, `on_decode` and
+    `on_error` hooks are still called.
+
+    Errors are counted whether the request failed, the response was
+    rejected after it arrived (for example, PowerfoxNoDataError), or the
+    request was never sent (PowerfoxCircuitOpenError). Only the exceptions
+    of `powerfox.exceptions` are counted; cancelled requests are neither
+    errors nor part of the latency histogram. Endpoints leave out device
+    IDs, so the number of series does not grow with the number of devices.
+    """
+
+    latency_buckets: tuple[float, ...] = LATENCY_BUCKETS
+    decode_buckets: tuple[float, ...] = DECODE_BUCKETS
+    size_buckets: tuple[float, ...] = SIZE_BUCKETS
+
+    requests: dict[str, int] = field(default_factory=dict, init=False)
+    errors: dict[tuple[str, str], int] = field(default_factory=dict, init=False)
+    latency: dict[str, Histogram] = field(default_factory=dict, init=False)
+    sizes: dict[str, Histogram] = field(default_factory=dict, init=False)
+    decode_latency: dict[str, Histogram] = field(default_factory=dict, init=False)
+
+    def report_request(self, timing: RequestTiming) -> None:
+        """Count a request and pass its timing to the hook, if any.
+
+        Args:
+        ----
+            timing: The timing of the request.
+
+        """
+        endpoint = timing.endpoint
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        if (error := timing.error) is not None and error in _ERRORS:
+            self._count_error(endpoint, error)
+        if not timing.cancelled:
+            if (latency := self.latency.get(endpoint)) is None:
+                latency = self.latency[endpoint] = Histogram(self.latency_buckets)
+            latency.observe(timing.total)
+        if timing.size is not None:
+            if (sizes := self.sizes.get(endpoint)) is None:
+                sizes = self.sizes[endpoint] = Histogram(self.size_buckets)
+            sizes.observe(timing.size)
+        super().report_request(timing)
+
+    def report_decode(self, timing: DecodeTiming) -> None:
+        """Count a decode step and pass its timing to the hook, if any.
+
+        Args:
+        ----
+            timing: The timing of the decode step.
+
+        """
+        operation = timing.operation
+        if (latency := self.decode_latency.get(operation)) is None:
+            latency = self.decode_latency[operation] = Histogram(self.decode_buckets)
+        latency.observe(timing.duration)
+        super().report_decode(timing)
+
+    def report_error(self, endpoint: str, error: PowerfoxError) -> None:
+        """Count an error raised outside of a request and pass it to the hook.
+
+        Args:
+        ----
+            endpoint: The endpoint the error belongs to, without IDs.
+            error: The error raised to the caller.
+
+        """
+        self._count_error(endpoint, type(error).__name__)
+        super().report_error(endpoint, error)
+
+    def _count_error(self, endpoint: str, error: str) -> None:
+        """Count an error by endpoint and exception class."""
+        key = (endpoint, error)
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+    def export(self, prefix: str = "powerfox") -> str:
+        """Return the metrics in the Prometheus text format.
+
+        Args:
+        ----
+            prefix: Prefix of the metric names.
+
+        Returns:
+        -------
+            The metrics, ready to be served to a Prometheus scraper.
+
+        """
+        lines: list[str] = []
+        _counter(
+            lines,
+            f"{prefix}_requests_total",
+            "Requests sent, by endpoint.",
+            (
+                ((("endpoint", endpoint),), count)
+                for endpoint, count in self.requests.items()
+            ),
+        )
+        _counter(
+            lines,
+            f"{prefix}_request_errors_total",
+            "Errors raised to the callers, by endpoint and exception class.",
+            (
+                ((("endpoint", endpoint), ("error", error)), count)
+                for (endpoint, error), count in self.errors.items()
+            ),
+        )
+        _histogram(
+            lines,
+            f"{prefix}_request_duration_seconds",
+            "Duration of the requests, by endpoint.",
+            "endpoint",
+            self.latency,
+        )
+        _histogram(
+            lines,
+            f"{prefix}_response_size_bytes",
+            "Size of the response bodies, by endpoint.",
+            "endpoint",
+            self.sizes,
+        )
+        _histogram(
+            lines,
+            f"{prefix}_decode_duration_seconds",
+            "Time spent decoding responses, by operation.",
+            "operation",
+            self.decode_latency,
+        )
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _labels(labels: Iterable[tuple[str, str]]) -> str:
+    """Return labels in the Prometheus text format."""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _number(value: float) -> str:
+    """Return a number in the Prometheus text format."""
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def _counter(
+    lines: list[str],
+    name: str,
+    description: str,
+    samples: Iterable[tuple[tuple[tuple[str, str], ...], int]],
+) -> None:
+    """Add a counter with its samples to the lines, if it has any."""
+    rendered = [f"{name}{_labels(labels)} {count}" for labels, count in samples]
+    if rendered:
+        lines.extend((f"# HELP {name} {description}", f"# TYPE {name} counter"))
+        lines.extend(rendered)
+
+
+def _histogram(
+    lines: list[str],
+    name: str,
+    description: str,
+    label: str,
+    histograms: dict[str, Histogram],
+) -> None:
+    """Add a histogram per label value to the lines, if there are any."""
+    if not histograms:
+        return
+    lines.extend((f"# HELP {name} {description}", f"# TYPE {name} histogram"))
+    for value, histogram in histograms.items():
+        for bound, count in histogram.cumulative():
+            labels = _labels(((label, value), ("le", _number(bound))))
+            lines.append(f"{name}_bucket{labels} {count}")
+        lines.append(f"{name}_sum{_labels(((label, value),))} {_number(histogram.sum)}")
+        lines.append(f"{name}_count{_labels(((label, value),))} {histogram.count}")
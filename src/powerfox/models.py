@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import IntEnum
-from typing import Any, ClassVar
+from typing import Any, ClassVar, NamedTuple, overload
 
 from mashumaro import field_options
 from mashumaro.mixins.orjson import DataClassORJSONMixin
@@ -21,6 +21,61 @@ def _deserialize_timestamp(value: int | None) -> datetime | None:
         return None
 
 
+class _EpochDatetime:
+    """Slot of a datetime field building the datetime on first access.
+
+    Decoding stores the raw epoch seconds from the API in the slot, the
+    (comparatively expensive) aware datetime is only created when the
+    field is read, and then replaces the epoch seconds in the slot.
+    """
+
+    __slots__ = ("_slot",)
+
+    def __init__(self, slot: Any) -> None:
+        """Wrap the member descriptor of the slot."""
+        self._slot = slot
+
+    @overload
+    def __get__(self, instance: None, owner: type) -> _EpochDatetime: ...
+
+    @overload
+    def __get__(self, instance: object, owner: type) -> datetime: ...
+
+    def __get__(
+        self, instance: object | None, owner: type
+    ) -> datetime | _EpochDatetime:
+        """Return the datetime, building it on first access."""
+        if instance is None:
+            return self
+        value = self._slot.__get__(instance, owner)
+        if isinstance(value, int):
+            value = datetime.fromtimestamp(value, tz=UTC)
+            self._slot.__set__(instance, value)
+        return value
+
+    def __set__(self, instance: object, value: datetime | int) -> None:
+        """Store a datetime, or epoch seconds to convert on first access."""
+        self._slot.__set__(instance, value)
+
+    def epoch(self, instance: object) -> int:
+        """Return the value in seconds since the epoch, without a datetime."""
+        # The member descriptor of the slot has to be called directly, going
+        # through the attribute would build the datetime.
+        value = self._slot.__get__(instance, type(instance))  # pylint: disable=unnecessary-dunder-call
+        return value if isinstance(value, int) else int(value.timestamp())
+
+
+def _epoch_datetime(cls: type, name: str) -> None:
+    """Make a datetime field of a slotted dataclass build its value lazily."""
+    setattr(cls, name, _EpochDatetime(vars(cls)[name]))
+
+
+def _epoch(instance: object, name: str) -> int:
+    """Return a lazily built datetime field in seconds since the epoch."""
+    descriptor: _EpochDatetime = getattr(type(instance), name)
+    return descriptor.epoch(instance)
+
+
 class DeviceType(IntEnum):
     """Enum for the different device types."""
 
@@ -45,37 +100,47 @@ class DeviceType(IntEnum):
         }.get(self, "Unknown")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Device(DataClassORJSONMixin):
     """Object representing a Device from Powerfox."""
 
     id: str = field(metadata=field_options(alias="DeviceId"))
     date_added: datetime = field(
-        metadata=field_options(
-            alias="AccountAssociatedSince",
-            deserialize=lambda x: datetime.fromtimestamp(x, tz=UTC),
-        )
+        metadata=field_options(alias="AccountAssociatedSince", deserialize=int)
     )
     main_device: bool = field(metadata=field_options(alias="MainDevice"))
     bidirectional: bool = field(metadata=field_options(alias="Prosumer"))
     type: DeviceType = field(metadata=field_options(alias="Division"))
     name: str = field(metadata=field_options(alias="Name"), default="Poweropti")
 
+    @property
+    def date_added_epoch(self) -> int:
+        """Return the date the device was added in seconds since the epoch."""
+        return _epoch(self, "date_added")
+
+
+_epoch_datetime(Device, "date_added")
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Poweropti(DataClassORJSONMixin):
     """Object representing a Poweropti device."""
 
     outdated: bool = field(metadata=field_options(alias="Outdated"))
     timestamp: datetime = field(
-        metadata=field_options(
-            alias="Timestamp",
-            deserialize=lambda x: datetime.fromtimestamp(x, tz=UTC),
-        )
+        metadata=field_options(alias="Timestamp", deserialize=int)
     )
 
+    @property
+    def timestamp_epoch(self) -> int:
+        """Return the timestamp in seconds since the epoch."""
+        return _epoch(self, "timestamp")
+
 
-@dataclass
+_epoch_datetime(Poweropti, "timestamp")
+
+
+@dataclass(frozen=True, slots=True)
 class PowerMeter(Poweropti):
     """Object representing a Power device."""
 
@@ -100,7 +165,7 @@ class PowerMeter(Poweropti):
     )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HeatMeter(Poweropti):
     """Object representing a Heat device."""
 
@@ -110,7 +175,7 @@ class HeatMeter(Poweropti):
     delta_volume: float = field(metadata=field_options(alias="DeltaCubicMeter"))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WaterMeter(Poweropti):
     """Object representing a Water device."""
 
@@ -118,16 +183,13 @@ class WaterMeter(Poweropti):
     warm_water: float = field(metadata=field_options(alias="CubicMeterWarm"))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ReportValue(DataClassORJSONMixin):
     """Object representing a report value entry."""
 
     device_id: str = field(metadata=field_options(alias="DeviceId"))
     timestamp: datetime = field(
-        metadata=field_options(
-            alias="Timestamp",
-            deserialize=lambda x: datetime.fromtimestamp(x, tz=UTC),
-        )
+        metadata=field_options(alias="Timestamp", deserialize=int)
     )
     complete: bool = field(metadata=field_options(alias="Complete"))
     values_type: int | None = field(
@@ -175,8 +237,16 @@ class ReportValue(DataClassORJSONMixin):
         default=None,
     )
 
+    @property
+    def timestamp_epoch(self) -> int:
+        """Return the timestamp in seconds since the epoch."""
+        return _epoch(self, "timestamp")
+
+
+_epoch_datetime(ReportValue, "timestamp")
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GasReport(DataClassORJSONMixin):
     """Object representing a gas report."""
 
@@ -256,7 +326,7 @@ class GasReport(DataClassORJSONMixin):
     )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EnergyReport(DataClassORJSONMixin):
     """Object representing an energy report section."""
 
@@ -300,7 +370,7 @@ class EnergyReport(DataClassORJSONMixin):
     )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DeviceReport(DataClassORJSONMixin):
     """Object representing a report response."""
 
@@ -318,7 +388,17 @@ class DeviceReport(DataClassORJSONMixin):
     )
 
 
-@dataclass
+# Fields of the local interface response, by OBIS code.
+LOCAL_OBIS_FIELDS: dict[str, str] = {
+    "1.7.0": "power",
+    "1.8.0": "energy_usage",
+    "1.8.1": "energy_usage_high_tariff",
+    "1.8.2": "energy_usage_low_tariff",
+    "2.8.0": "energy_return",
+}
+
+
+@dataclass(frozen=True, slots=True)
 class LocalResponse(DataClassORJSONMixin):
     """Object representing the local interface response.
 
@@ -326,25 +406,20 @@ class LocalResponse(DataClassORJSONMixin):
     Units: power in W, energy values in Wh.
     """
 
-    _OBIS_MAP: ClassVar[dict[str, str]] = {
-        "1.7.0": "power",
-        "1.8.0": "energy_usage",
-        "1.8.1": "energy_usage_high_tariff",
-        "1.8.2": "energy_usage_low_tariff",
-        "2.8.0": "energy_return",
-    }
+    _OBIS_MAP: ClassVar[dict[str, str]] = LOCAL_OBIS_FIELDS
 
-    timestamp: datetime = field(
-        metadata=field_options(
-            deserialize=lambda x: datetime.fromtimestamp(x, tz=UTC),
-        )
-    )
+    timestamp: datetime = field(metadata=field_options(deserialize=int))
     power: int | None = None
     energy_usage: int | None = None
     energy_usage_high_tariff: int | None = None
     energy_usage_low_tariff: int | None = None
     energy_return: int | None = None
 
+    @property
+    def timestamp_epoch(self) -> int:
+        """Return the timestamp in seconds since the epoch."""
+        return _epoch(self, "timestamp")
+
     @classmethod
     def __pre_deserialize__(cls, d: dict[str, Any]) -> dict[str, Any]:
         """Map OBIS values array to flat fields before deserialization."""
@@ -353,3 +428,26 @@ class LocalResponse(DataClassORJSONMixin):
             if field_name:
                 d[field_name] = item["value"]
         return d
+
+
+_epoch_datetime(LocalResponse, "timestamp")
+
+
+class LocalSample(NamedTuple):
+    """Object representing a compact sample of the local interface.
+
+    Holds the same values as LocalResponse in a plain tuple, for sampling
+    at a high rate. Units: power in W, energy values in Wh.
+    """
+
+    timestamp_epoch: int
+    power: int | None = None
+    energy_usage: int | None = None
+    energy_usage_high_tariff: int | None = None
+    energy_usage_low_tariff: int | None = None
+    energy_return: int | None = None
+
+    @property
+    def timestamp(self) -> datetime:
+        """Return the timestamp of the sample."""
+        return datetime.fromtimestamp(self.timestamp_epoch, tz=UTC)
@@ -3,31 +3,86 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import math
 import socket
-from dataclasses import dataclass
+from base64 import b64encode
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from importlib import metadata
-from typing import Annotated, Any, Self
-
-from aiohttp import BasicAuth, ClientError, ClientResponseError, ClientSession
+from itertools import islice
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Self
+
+import orjson
+from aiohttp import (
+    ClientError,
+    ClientResponseError,
+    ClientSession,
+    TCPConnector,
+)
 from aiohttp.hdrs import METH_GET
-from mashumaro.codecs.orjson import ORJSONDecoder
-from mashumaro.exceptions import SuitableVariantNotFoundError
-from mashumaro.types import Discriminator
 from yarl import URL
 
+from .columnar import ColumnarReport
+from .decoders import PowerOptiVariant, data_decoder
 from .exceptions import (
     PowerfoxAuthenticationError,
+    PowerfoxCircuitOpenError,
     PowerfoxConnectionError,
     PowerfoxError,
     PowerfoxNoDataError,
     PowerfoxPrivacyError,
+    PowerfoxRateLimitError,
     PowerfoxUnsupportedDeviceError,
 )
-from .models import Device, DeviceReport, Poweropti
+from .history import ReportGranularity, ReportPeriod, plan_report_periods
+from .instrumentation import DISABLED, decoding
+from .models import Device, DeviceReport, DeviceType, Poweropti
+from .ratelimit import parse_retry_after
+from .resilience import send_with_policies
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Iterable, Mapping
+    from contextlib import AbstractContextManager
+    from datetime import date
+
+    from .cache import ResponseCache
+    from .instrumentation import Instrumentation, RequestTrace
+    from .ratelimit import RateLimiter
+    from .reportcache import ReportCache
+    from .resilience import CircuitBreaker, RetryPolicy
 
 VERSION: str = metadata.version(__package__)  # ty:ignore[invalid-argument-type]
 
+API_URL = URL("https://backend.powerfox.energy/api/2.0/")
+
+# URI and sorted query parameters of a GET request.
+_RequestKey = tuple[str, tuple[tuple[str, Any], ...]]
+
+
+@dataclass(slots=True)
+class _SharedRequest:
+    """A GET request in flight and the number of callers waiting for it."""
+
+    future: asyncio.Future[bytes]
+    waiters: int = 0
+
+
+@lru_cache(maxsize=1024)
+def _api_url(base_url: URL, uri: str) -> URL:
+    """Return the absolute URL of an API endpoint."""
+    return base_url.join(URL(uri))
+
+
+@lru_cache(maxsize=1024)
+def _endpoint(uri: str) -> str:
+    """Return the endpoint of a URI, with the device ID left out."""
+    match uri.split("/"):
+        case ["my", device_id, *rest] if device_id != "all":
+            return "/".join(["my", "{device_id}", *rest])
+    return uri
+
 
 @dataclass
 class Powerfox:
@@ -38,19 +93,48 @@ class Powerfox:
 
     request_timeout: float = 30.0
     session: ClientSession | None = None
+    cache: ResponseCache | None = None
+    rate_limiter: RateLimiter | None = None
+    retry_policy: RetryPolicy | None = None
+    circuit_breaker: CircuitBreaker | None = None
+    report_cache: ReportCache | None = None
+    instrumentation: Instrumentation | None = None
+    base_url: URL = API_URL
+
+    # Connection pool of the session created when none is passed in. The API
+    # lives on a single host, so keep a few connections open for a while to
+    # skip the TCP and TLS handshake on subsequent requests.
+    connection_limit: int = 10
+    keepalive_timeout: float = 60.0
+    dns_cache_ttl: int = 300
 
     _close_session: bool = False
+    _headers: Mapping[str, str] = field(init=False, repr=False, compare=False)
+    _in_flight: dict[_RequestKey, _SharedRequest] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
-    def _raise_for_embedded_api_error(self, response_text: str) -> None:
-        """Raise if Powerfox returned an API error envelope inside HTTP 200."""
-        if '"StatusCode"' not in response_text:
-            return
+    def __post_init__(self) -> None:
+        """Prepare the headers sent with every request.
 
-        try:
-            api_response = json.loads(response_text)
-        except json.JSONDecodeError:
-            return
+        The credentials are encoded here once, changing them afterwards
+        requires a new client.
+        """
+        credentials = b64encode(f"{self.username}:{self.password}".encode("latin1"))
+        self._headers = MappingProxyType(
+            {
+                "Accept": "application/json",
+                "Authorization": f"Basic {credentials.decode('ascii')}",
+                "User-Agent": f"PythonPowerfox/{VERSION}",
+            }
+        )
 
+    def _raise_for_embedded_api_error(self, api_response: Any) -> None:
+        """Raise if Powerfox returned an API error envelope inside HTTP 200.
+
+        Works on the already parsed response, so the check is a single key
+        lookup instead of another pass over the payload.
+        """
         if (
             not isinstance(api_response, dict)
             or not isinstance(status_code := api_response.get("StatusCode"), int)
@@ -78,15 +162,64 @@ class Powerfox:
                     },
                 )
 
+    def _ensure_session(self) -> ClientSession:
+        """Return the client session, creating a pooled one if needed."""
+        if self.session is None:
+            self.session = ClientSession(
+                connector=TCPConnector(
+                    limit_per_host=self.connection_limit,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                ),
+                trace_configs=(
+                    [self.instrumentation.trace_config()]
+                    if self.instrumentation is not None
+                    else None
+                ),
+            )
+            self._close_session = True
+        return self.session
+
+    def _trace(
+        self,
+        method: str,
+        uri: str,
+    ) -> AbstractContextManager[RequestTrace | None]:
+        """Return a trace timing a request, if instrumented."""
+        if self.instrumentation is None:
+            return DISABLED
+        return self.instrumentation.request(
+            method, self.base_url.host or "", _endpoint(uri)
+        )
+
+    def _report_error(self, uri: str, error: PowerfoxError) -> PowerfoxError:
+        """Report an error raised outside of a request, if instrumented.
+
+        Errors of the request itself are part of its RequestTiming.
+
+        Returns
+        -------
+            The error, to be raised.
+
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.report_error(_endpoint(uri), error)
+        return error
+
     async def _request(
         self,
         uri: str,
         *,
         method: str = METH_GET,
         params: dict[str, Any] | None = None,
-    ) -> Any:
+    ) -> bytes:
         """Handle a request to the Powerfox API.
 
+        Identical GET requests made while one is already in flight do not
+        hit the API again, they share the response (or the error) of the
+        request in flight instead. The request is cancelled once every
+        caller waiting for it is cancelled.
+
         Args:
         ----
             uri: Request URI, without '/api/', for example, 'status'.
@@ -95,8 +228,7 @@ class Powerfox:
 
         Returns:
         -------
-            A Python dictionary (JSON decoded) with the response from
-            the Powerfox API.
+            The raw (JSON encoded) response body from the Powerfox API.
 
         Raises:
         ------
@@ -105,60 +237,204 @@ class Powerfox:
             PowerfoxError: Received an unexpected response from the Powerfox API.
 
         """
-        url = URL.build(
-            scheme="https",
-            host="backend.powerfox.energy",
-            path="/api/2.0/",
-        ).join(URL(uri))
+        if method != METH_GET:
+            return await self._send(uri, method=method, params=params)
 
-        headers = {
-            "Accept": "application/json",
-            "User-Agent": f"PythonPowerfox/{VERSION}",
-        }
+        key = (uri, tuple(sorted(params.items())) if params else ())
+        if (shared := self._in_flight.get(key)) is None:
+            shared = _SharedRequest(
+                asyncio.ensure_future(self._send(uri, params=params))
+            )
+            self._in_flight[key] = shared
+            shared.future.add_done_callback(partial(self._request_done, key, shared))
+        shared.waiters += 1
+        try:
+            # Shielded, so a cancelled caller does not cancel the other callers.
+            return await asyncio.shield(shared.future)
+        finally:
+            shared.waiters -= 1
+            if not shared.waiters and not shared.future.done():
+                # The last caller was cancelled, nobody needs the response.
+                self._forget_request(key, shared)
+                shared.future.cancel()
+
+    def _forget_request(self, key: _RequestKey, shared: _SharedRequest) -> None:
+        """Stop sharing a request with new callers."""
+        if self._in_flight.get(key) is shared:
+            del self._in_flight[key]
+
+    def _request_done(
+        self,
+        key: _RequestKey,
+        shared: _SharedRequest,
+        request: asyncio.Future[bytes],
+    ) -> None:
+        """Forget a finished in-flight request."""
+        self._forget_request(key, shared)
+        if not request.cancelled():
+            # Mark the error as retrieved, in case every caller was cancelled.
+            request.exception()
+
+    async def _send(
+        self,
+        uri: str,
+        *,
+        method: str = METH_GET,
+        params: dict[str, Any] | None = None,
+    ) -> bytes:
+        """Send a request, applying the retry policy and circuit breaker."""
+        try:
+            return await send_with_policies(
+                partial(self._send_once, uri, method=method, params=params),
+                retry_policy=self.retry_policy,
+                circuit_breaker=self.circuit_breaker,
+                idempotent=method == METH_GET,
+            )
+        except PowerfoxCircuitOpenError as error:
+            # Raised without sending a request, so without a RequestTiming.
+            self._report_error(uri, error)
+            raise
 
-        if self.session is None:
-            self.session = ClientSession()
-            self._close_session = True
+    async def _send_once(
+        self,
+        uri: str,
+        *,
+        method: str = METH_GET,
+        params: dict[str, Any] | None = None,
+    ) -> bytes:
+        """Send a single request to the Powerfox API.
 
-        # Set basic auth credentials.
-        auth = BasicAuth(self.username, self.password)
+        Args:
+        ----
+            uri: Request URI, without '/api/', for example, 'status'.
+            method: HTTP method to use.
+            params: Extra options to improve or limit the response.
 
-        try:
-            async with asyncio.timeout(self.request_timeout):
-                response = await self.session.request(
-                    method,
-                    url,
-                    auth=auth,
-                    headers=headers,
-                    params=params,
-                    ssl=True,
+        Returns:
+        -------
+            The raw (JSON encoded) response body from the Powerfox API.
+
+        Raises:
+        ------
+            PowerfoxConnectionError: An error occurred while communicating
+                with the Powerfox API.
+            PowerfoxError: Received an unexpected response from the Powerfox API.
+
+        """
+        session = self._ensure_session()
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+
+        with self._trace(method, uri) as trace:
+            try:
+                async with asyncio.timeout(self.request_timeout):
+                    response = await session.request(
+                        method,
+                        _api_url(self.base_url, uri),
+                        headers=self._headers,
+                        params=params,
+                        ssl=True,
+                        trace_request_ctx=trace,
+                    )
+                    if trace is not None:
+                        trace.received(response.status)
+                    response.raise_for_status()
+            except TimeoutError as exception:
+                msg = "Timeout occurred while connecting to Powerfox API."
+                raise PowerfoxConnectionError(msg) from exception
+            except ClientResponseError as exception:
+                if exception.status == 401:
+                    msg = "Authentication to the Powerfox API failed."
+                    raise PowerfoxAuthenticationError(msg) from exception
+                if exception.status == 429:
+                    retry_after = parse_retry_after(exception.headers)
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.throttled(retry_after)
+                    msg = "Rate limit of the Powerfox API exceeded."
+                    raise PowerfoxRateLimitError(
+                        msg, retry_after=retry_after
+                    ) from exception
+                msg = "Error occurred while communicating with Powerfox API."
+                raise PowerfoxConnectionError(msg) from exception
+            except (ClientError, socket.gaierror) as exception:
+                msg = "Error occurred while communicating with Powerfox API."
+                raise PowerfoxConnectionError(msg) from exception
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.succeeded()
+
+            content_type = response.headers.get("Content-Type", "")
+            if "application/json" not in content_type:
+                text = await response.text()
+                msg = "Unexpected content type response from Powerfox API."
+                raise PowerfoxError(
+                    msg,
+                    {"Content-Type": content_type, "Response": text},
                 )
-                response.raise_for_status()
-        except TimeoutError as exception:
-            msg = "Timeout occurred while connecting to Powerfox API."
-            raise PowerfoxConnectionError(msg) from exception
-        except ClientResponseError as exception:
-            if exception.status == 401:
-                msg = "Authentication to the Powerfox API failed."
-                raise PowerfoxAuthenticationError(msg) from exception
-            msg = "Error occurred while communicating with Powerfox API."
-            raise PowerfoxConnectionError(msg) from exception
-        except (ClientError, socket.gaierror) as exception:
-            msg = "Error occurred while communicating with Powerfox API."
-            raise PowerfoxConnectionError(msg) from exception
 
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" not in content_type:
-            text = await response.text()
-            msg = "Unexpected content type response from Powerfox API."
-            raise PowerfoxError(
-                msg,
-                {"Content-Type": content_type, "Response": text},
-            )
+            body = await response.read()
+            if trace is not None:
+                trace.read(len(body))
+            return body
+
+    async def _request_json(
+        self,
+        uri: str,
+        *,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        """Request and parse a JSON document from the Powerfox API.
 
-        response_text = await response.text()
-        self._raise_for_embedded_api_error(response_text)
-        return response_text
+        Args:
+        ----
+            uri: Request URI, without '/api/', for example, 'status'.
+            params: Extra options to improve or limit the response.
+
+        Returns:
+        -------
+            The parsed JSON response from the Powerfox API.
+
+        """
+        response = await self._request(uri, params=params)
+        with decoding(self.instrumentation, "json"):
+            data = orjson.loads(response)
+        try:
+            self._raise_for_embedded_api_error(data)
+        except PowerfoxError as error:
+            self._report_error(uri, error)
+            raise
+        return data
+
+    async def _current(self, device_id: str) -> dict[str, Any]:
+        """Get the parsed realtime data of a device.
+
+        Served from the response cache, when configured, while it is fresh.
+
+        Args:
+        ----
+            device_id: The device ID to get the data for.
+
+        Returns:
+        -------
+            The parsed realtime data.
+
+        Raises:
+        ------
+            PowerfoxNoDataError: If the response is empty.
+
+        """
+        uri = f"my/{device_id}/current"
+        if self.cache is not None and (data := self.cache.get(uri)) is not None:
+            return data
+
+        data = await self._request_json(uri, params={"unit": "kwh"})
+        if not data:
+            msg = f"No data available for Poweropti device {device_id}."
+            raise self._report_error(uri, PowerfoxNoDataError(msg))
+
+        if self.cache is not None:
+            self.cache.set(uri, data)
+        return data
 
     async def all_devices(self) -> list[Device]:
         """Get list of all Poweropti devices.
@@ -172,11 +448,13 @@ class Powerfox:
             PowerfoxNoDataError: If no devices are found or the response is empty.
 
         """
-        response = await self._request("my/all/devices")
-        if response == "[]":
+        uri = "my/all/devices"
+        data = await self._request_json(uri)
+        if not data:
             msg = "No Poweropti devices found."
-            raise PowerfoxNoDataError(msg)
-        return ORJSONDecoder(list[Device]).decode(response)
+            raise self._report_error(uri, PowerfoxNoDataError(msg))
+        with decoding(self.instrumentation, "all_devices"):
+            return data_decoder(list[Device]).decode(data)
 
     async def device(self, device_id: str) -> Poweropti:
         """Get information about a specific Poweropti device.
@@ -194,36 +472,115 @@ class Powerfox:
             PowerfoxNoDataError: If the response is empty or invalid JSON.
 
         """
-        response = await self._request(
-            f"my/{device_id}/current",
-            params={"unit": "kwh"},
-        )
-        if response == "{}":
-            msg = f"No data available for Poweropti device {device_id}."
-            raise PowerfoxNoDataError(msg)
-
+        uri = f"my/{device_id}/current"
+        data = await self._current(device_id)
         try:
-            return ORJSONDecoder(
-                Annotated[Poweropti, Discriminator(include_subtypes=True)]
-            ).decode(response)
-        except SuitableVariantNotFoundError as err:
-            data = ORJSONDecoder(dict).decode(response)
+            with decoding(self.instrumentation, "device"):
+                return data_decoder(PowerOptiVariant).decode(data)
+        except ValueError as err:
+            # Raised by the union of variants when none of them matches.
             division = data.get("Division", "unknown")
             msg = (
                 "Unsupported device type received "
                 f"(Division={division}) for device {device_id}."
             )
-            raise PowerfoxUnsupportedDeviceError(msg) from err
+            raise self._report_error(uri, PowerfoxUnsupportedDeviceError(msg)) from err
 
-    async def report(
+    async def devices(
+        self,
+        device_ids: Iterable[str],
+        *,
+        concurrency: int = 10,
+    ) -> dict[str, Poweropti | PowerfoxError]:
+        """Get information about several Poweropti devices concurrently.
+
+        A failing device does not fail the whole batch, its exception is
+        returned in place of the data instead. Failed authentication fails
+        every device alike, so it stops the batch, as does any error that
+        is not a PowerfoxError; the requests still running are cancelled.
+
+        Args:
+        ----
+            device_ids: The device IDs to get information about.
+            concurrency: Maximum number of requests in flight at once.
+
+        Returns:
+        -------
+            A mapping of device ID to its data or the PowerfoxError raised
+            while fetching it, in the order the IDs were given.
+
+        Raises:
+        ------
+            ValueError: If concurrency is lower than 1.
+            PowerfoxAuthenticationError: Authentication to the Powerfox API
+                failed.
+
+        """
+        if concurrency < 1:
+            msg = "Parameter 'concurrency' must be at least 1."
+            raise ValueError(msg)
+
+        unique_ids = list(dict.fromkeys(device_ids))
+        remaining = iter(unique_ids)
+        results: dict[str, Poweropti | PowerfoxError] = {}
+
+        async def _worker() -> None:
+            for device_id in remaining:
+                try:
+                    results[device_id] = await self.device(device_id)
+                except PowerfoxAuthenticationError:
+                    raise
+                except PowerfoxError as err:
+                    results[device_id] = err
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for _ in range(min(concurrency, len(unique_ids))):
+                    group.create_task(_worker())
+        except BaseExceptionGroup as error:
+            # Raise the first error itself, as a single device would.
+            raise error.exceptions[0] from error.exceptions[0].__cause__
+        return {device_id: results[device_id] for device_id in unique_ids}
+
+    async def all_current(
+        self,
+        *,
+        concurrency: int = 10,
+    ) -> dict[str, Poweropti | PowerfoxError]:
+        """Get information about all Poweropti devices of the account.
+
+        The FLOW gas meter has no realtime data and is skipped, use
+        `report()` for those devices.
+
+        Args:
+        ----
+            concurrency: Maximum number of requests in flight at once.
+
+        Returns:
+        -------
+            A mapping of device ID to its data or the PowerfoxError raised
+            while fetching it.
+
+        Raises:
+        ------
+            PowerfoxNoDataError: If no devices are found or the response is empty.
+
+        """
+        devices = await self.all_devices()
+        return await self.devices(
+            (device.id for device in devices if device.type != DeviceType.GAS_METER),
+            concurrency=concurrency,
+        )
+
+    async def _report_data(
         self,
         device_id: str,
         *,
         year: int | None = None,
         month: int | None = None,
         day: int | None = None,
-    ) -> DeviceReport:
-        """Get report information for a specific device.
+    ) -> dict[str, Any]:
+        """Get the parsed report data for a specific device.
 
         Args:
         ----
@@ -234,11 +591,11 @@ class Powerfox:
 
         Returns:
         -------
-            Report data for the requested device.
+            The parsed report data, from the report cache if it is final.
 
         Raises:
         ------
-            PowerfoxNoDataError: If the response is empty or invalid JSON.
+            PowerfoxNoDataError: If the response is empty.
 
         """
         if month is not None and year is None:
@@ -256,17 +613,213 @@ class Powerfox:
         if day is not None:
             params["day"] = day
 
-        response = await self._request(
-            f"my/{device_id}/report",
-            params=params or None,
-        )
+        # Reports without a year cover the last 24 hours, never cache those.
+        report_cache = self.report_cache
+        if (
+            year is not None
+            and report_cache is not None
+            and (
+                cached := await asyncio.to_thread(
+                    report_cache.get, device_id, year, month, day
+                )
+            )
+        ):
+            return cached
 
-        data = ORJSONDecoder(dict).decode(response)
+        uri = f"my/{device_id}/report"
+        data = await self._request_json(uri, params=params or None)
         if not data:
             msg = f"No report data available for Poweropti device {device_id}."
-            raise PowerfoxNoDataError(msg)
+            raise self._report_error(uri, PowerfoxNoDataError(msg))
+        if year is not None and report_cache is not None:
+            await asyncio.to_thread(report_cache.set, device_id, data, year, month, day)
+        return data
+
+    async def report(
+        self,
+        device_id: str,
+        *,
+        year: int | None = None,
+        month: int | None = None,
+        day: int | None = None,
+    ) -> DeviceReport:
+        """Get report information for a specific device.
+
+        Args:
+        ----
+            device_id: The device ID to get report data for.
+            year: Optional year to filter report data.
+            month: Optional month to filter report data (requires year).
+            day: Optional day to filter report data (requires year and month).
+
+        Returns:
+        -------
+            Report data for the requested device.
+
+        Raises:
+        ------
+            PowerfoxNoDataError: If the response is empty or invalid JSON.
+
+        """
+        data = await self._report_data(device_id, year=year, month=month, day=day)
+        with decoding(self.instrumentation, "report"):
+            return data_decoder(DeviceReport).decode(data)
+
+    async def columnar_report(
+        self,
+        device_id: str,
+        *,
+        year: int | None = None,
+        month: int | None = None,
+        day: int | None = None,
+    ) -> ColumnarReport:
+        """Get report information for a specific device in columnar form.
+
+        Same as `report()`, but the report values of each section are
+        stored in compact columns (see `ReportColumns`) instead of lists of
+        ReportValue objects, which are never created.
+
+        Args:
+        ----
+            device_id: The device ID to get report data for.
+            year: Optional year to filter report data.
+            month: Optional month to filter report data (requires year).
+            day: Optional day to filter report data (requires year and month).
+
+        Returns:
+        -------
+            Report data for the requested device.
+
+        Raises:
+        ------
+            PowerfoxNoDataError: If the response is empty or invalid JSON.
+
+        """
+        data = await self._report_data(device_id, year=year, month=month, day=day)
+        with decoding(self.instrumentation, "columnar_report"):
+            return ColumnarReport.from_dict(data)
+
+    async def report_range(
+        self,
+        device_id: str,
+        start: date,
+        end: date,
+        granularity: ReportGranularity | str = ReportGranularity.DAY,
+        *,
+        concurrency: int = 4,
+    ) -> AsyncGenerator[ReportPeriod]:
+        """Get the reports for every period in a date range.
+
+        Requests for the following periods are sent ahead while a report is
+        being consumed, with at most `concurrency` in flight, so besides the
+        report being consumed only that many are held in memory, regardless
+        of the length of the range. Periods without data are skipped.
+
+        Args:
+        ----
+            device_id: The device ID to get report data for.
+            start: First day of the range.
+            end: Last day of the range (inclusive).
+            granularity: Period covered by each report: year, month or day.
+            concurrency: Maximum number of requests in flight at once.
+
+        Yields:
+        ------
+            The report of each period, in chronological order.
+
+        Raises:
+        ------
+            ValueError: If the range is empty or concurrency is lower than 1.
+
+        """
+        if concurrency < 1:
+            msg = "Parameter 'concurrency' must be at least 1."
+            raise ValueError(msg)
+        if end.toordinal() < start.toordinal():
+            msg = "Parameter 'end' must not be before 'start'."
+            raise ValueError(msg)
+
+        granularity = ReportGranularity(granularity)
+        periods = plan_report_periods(start, end, granularity)
+        pending: deque[tuple[date, asyncio.Future[DeviceReport]]] = deque()
+
+        def _prefetch() -> None:
+            for period in islice(periods, concurrency - len(pending)):
+                request = self.report(device_id, **granularity.params(period))
+                pending.append((period, asyncio.ensure_future(request)))
+
+        try:
+            _prefetch()
+            while pending:
+                period, request = pending.popleft()
+                try:
+                    report: DeviceReport | None = await request
+                except PowerfoxNoDataError:
+                    report = None
+                # Refill only now, the awaited request counted as in flight.
+                _prefetch()
+                if report is not None:
+                    yield ReportPeriod(period, granularity, report)
+        finally:
+            for _, request in pending:
+                request.cancel()
+            await asyncio.gather(
+                *(request for _, request in pending), return_exceptions=True
+            )
+
+    async def watch(
+        self,
+        device_id: str,
+        interval: float = 5.0,
+        *,
+        max_interval: float = 300.0,
+    ) -> AsyncGenerator[Poweropti]:
+        """Watch the realtime data of a device.
 
-        return ORJSONDecoder(DeviceReport).decode(response)
+        Polls the device on a fixed schedule that does not drift with the
+        time spent on requests or by the consumer; missed polls are skipped
+        instead of sent in a burst. While the reading is outdated, the
+        interval doubles up to `max_interval`. Breaking out of the loop or
+        cancelling the consumer stops the polling.
+
+        Args:
+        ----
+            device_id: The device ID to watch.
+            interval: Seconds between polls.
+            max_interval: Longest interval while the reading is outdated.
+
+        Yields:
+        ------
+            Each new reading, whenever its timestamp moves forward.
+
+        Raises:
+        ------
+            ValueError: If the interval is not positive.
+
+        """
+        if interval <= 0:
+            msg = "Parameter 'interval' must be positive."
+            raise ValueError(msg)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        delay = interval
+        last: int | None = None
+        while True:
+            poweropti = await self.device(device_id)
+            if poweropti.outdated:
+                delay = min(delay * 2, max(interval, max_interval))
+            else:
+                delay = interval
+            if last is None or poweropti.timestamp_epoch > last:
+                last = poweropti.timestamp_epoch
+                yield poweropti
+
+            now = loop.time()
+            deadline += delay
+            if deadline < now:
+                deadline += math.ceil((now - deadline) / delay) * delay
+            await asyncio.sleep(deadline - now)
 
     async def raw_device_data(self, device_id: str) -> dict[str, Any]:
         """Get raw JSON data for a specific Poweropti device.
@@ -284,16 +837,44 @@ class Powerfox:
             PowerfoxNoDataError: If the response is empty or invalid JSON.
 
         """
-        response = await self._request(
-            f"my/{device_id}/current",
-            params={"unit": "kwh"},
-        )
+        # Hand out a copy, callers may modify it while it is still cached.
+        return dict(await self._current(device_id))
 
-        data = ORJSONDecoder(dict).decode(response)
-        if not data:
-            msg = f"No data available for Poweropti device {device_id}."
-            raise PowerfoxNoDataError(msg)
-        return data
+    async def prewarm(self, connections: int = 1) -> None:
+        """Open connections to the Powerfox API ahead of the first request.
+
+        Resolves the host name and completes the TCP and TLS handshakes,
+        leaving the connections in the pool for the requests that follow.
+
+        Args:
+        ----
+            connections: Number of connections to open, capped by
+                `connection_limit`.
+
+        Raises:
+        ------
+            PowerfoxConnectionError: An error occurred while connecting
+                to the Powerfox API.
+
+        """
+        session = self._ensure_session()
+        if self.connection_limit:
+            connections = min(connections, self.connection_limit)
+        url = self.base_url.origin()
+
+        async def _open() -> None:
+            async with session.head(url, ssl=True):
+                pass
+
+        try:
+            async with asyncio.timeout(self.request_timeout):
+                await asyncio.gather(*(_open() for _ in range(connections)))
+        except TimeoutError as exception:
+            msg = "Timeout occurred while connecting to Powerfox API."
+            raise PowerfoxConnectionError(msg) from exception
+        except (ClientError, socket.gaierror) as exception:
+            msg = "Error occurred while connecting to Powerfox API."
+            raise PowerfoxConnectionError(msg) from exception
 
     async def close(self) -> None:
         """Close open client session."""
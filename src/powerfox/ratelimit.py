@@ -0,0 +1,119 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+def parse_retry_after(headers: Mapping[str, str] | None) -> float | None:
+    """Return the number of seconds a `Retry-After` header asks to wait.
+
+    Args:
+    ----
+        headers: The response headers.
+
+    Returns:
+    -------
+        The delay in seconds, or None if the header is missing or invalid.
+
+    """
+    if not headers or (value := headers.get("Retry-After")) is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        # Dates with a "-0000" offset parse as naive, HTTP dates are in UTC.
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(tz=UTC)).total_seconds())
+
+
+@dataclass
+class RateLimiter:
+    """Token bucket limiting the rate of requests to the Powerfox API.
+
+    Allows bursts of up to `burst` requests and `rate` requests per second
+    on average. Pass the same instance to several clients to share the
+    budget of one account.
+
+    When the API answers with HTTP 429, the rate is halved (down to
+    `min_rate`) and no requests are sent until the `Retry-After` delay has
+    passed. Each successful request then raises the rate again by a tenth
+    of `rate`, until it is back at `rate`.
+    """
+
+    rate: float = 2.0
+    burst: int = 5
+    min_rate: float = 0.1
+
+    current_rate: float = field(init=False)
+
+    _tokens: float = field(init=False, repr=False)
+    _updated: float = field(init=False, repr=False)
+    _blocked_until: float = field(default=0.0, init=False, repr=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Start with a full bucket at the configured rate."""
+        self.current_rate = self.rate
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last update."""
+        self._tokens = min(
+            float(self.burst),
+            self._tokens + (now - self._updated) * self.current_rate,
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        # Waiters queue on the lock, so tokens are handed out in order.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.current_rate)
+
+    def throttled(self, retry_after: float | None = None) -> None:
+        """Slow down after the API rejected a request with HTTP 429.
+
+        Args:
+        ----
+            retry_after: Seconds the API asked to wait, if given.
+
+        """
+        now = time.monotonic()
+        self.current_rate = max(self.min_rate, self.current_rate / 2)
+        self._tokens = 0.0
+        self._updated = now
+        self._blocked_until = max(
+            self._blocked_until,
+            now + (retry_after if retry_after is not None else 1 / self.current_rate),
+        )
+
+    def succeeded(self) -> None:
+        """Speed up again after a request was accepted."""
+        if self.current_rate < self.rate:
+            self._refill(time.monotonic())
+            self.current_rate = min(self.rate, self.current_rate + self.rate / 10)
@@ -0,0 +1,270 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import orjson
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Sections of a report response holding report values.
+_SECTIONS = ("Gas", "Consumption", "FeedIn")
+
+# Data of a closed period may still be completed a while after it ended, and
+# the API closes periods in local time. Wait this long before trusting it.
+SETTLE_TIME = timedelta(days=1)
+
+# Reading a report only records the access when the recorded one is older
+# than this many seconds, so hits rarely have to write to the database.
+ACCESS_RESOLUTION = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    device_id TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (device_id, year, month, day)
+)
+"""
+
+_KEY = "device_id = ? AND year = ? AND month = ? AND day = ?"
+
+
+def period_end(year: int, month: int | None = None, day: int | None = None) -> datetime:
+    """Return the (exclusive) end of a report period.
+
+    Args:
+    ----
+        year: Year of the period.
+        month: Month of the period, for monthly and daily periods.
+        day: Day of the period, for daily periods.
+
+    Returns:
+    -------
+        The start of the next period, in UTC.
+
+    """
+    if month is None:
+        return datetime(year + 1, 1, 1, tzinfo=UTC)
+    if day is None:
+        return datetime(year + month // 12, month % 12 + 1, 1, tzinfo=UTC)
+    return datetime(year, month, day, tzinfo=UTC) + timedelta(days=1)
+
+
+def is_final_report(
+    data: dict[str, Any],
+    year: int,
+    month: int | None = None,
+    day: int | None = None,
+) -> bool:
+    """Return whether a report will not change anymore.
+
+    A report is final once its period has ended (plus `SETTLE_TIME`) and
+    all of its report values are marked complete.
+
+    Args:
+    ----
+        data: The parsed report response.
+        year: Year of the period.
+        month: Month of the period, for monthly and daily periods.
+        day: Day of the period, for daily periods.
+
+    Returns:
+    -------
+        True if the report can be cached for good.
+
+    """
+    if period_end(year, month, day) + SETTLE_TIME > datetime.now(tz=UTC):
+        return False
+    return all(
+        value.get("Complete") is True
+        for name in _SECTIONS
+        if isinstance(section := data.get(name), dict)
+        for value in section.get("ReportValues") or ()
+    )
+
+
+@dataclass
+class ReportCache:
+    """Persistent SQLite cache for the reports of closed periods.
+
+    Only final reports (see `is_final_report`) are stored, so a cached
+    report never goes stale. When the cache holds more than `max_entries`
+    reports or `max_size` bytes, the least recently used reports are
+    removed.
+
+    The last access of a report is only updated when it is older than
+    `access_resolution` seconds, so the eviction order is that coarse.
+
+    The database is opened on first use and uses write-ahead logging, so
+    several processes can share the same file. The methods block on the
+    database, the clients therefore call them in a worker thread; a lock
+    keeps those calls from using the connection at the same time.
+    """
+
+    path: str | Path
+    max_entries: int = 10_000
+    max_size: int | None = None
+    timeout: float = 5.0
+    access_resolution: float = ACCESS_RESOLUTION
+
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+
+    _connection: sqlite3.Connection | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the database connection, opening it when needed.
+
+        Must be called with the lock held.
+        """
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def __len__(self) -> int:
+        """Return the number of cached reports."""
+        with self._lock:
+            connection = self._connect()
+            (count,) = connection.execute("SELECT COUNT(*) FROM reports").fetchone()
+        return count
+
+    def get(
+        self,
+        device_id: str,
+        year: int,
+        month: int | None = None,
+        day: int | None = None,
+    ) -> dict[str, Any] | None:
+        """Return a cached report.
+
+        Args:
+        ----
+            device_id: The device ID of the report.
+            year: Year of the period.
+            month: Month of the period, for monthly and daily periods.
+            day: Day of the period, for daily periods.
+
+        Returns:
+        -------
+            The parsed report response, or None if it is not cached.
+
+        """
+        key = (device_id, year, month or 0, day or 0)
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                f"SELECT data, accessed FROM reports WHERE {_KEY}",  # noqa: S608
+                key,
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            now = time.time()
+            if now - row[1] > self.access_resolution:
+                with connection:
+                    connection.execute(
+                        f"UPDATE reports SET accessed = ? WHERE {_KEY}",  # noqa: S608
+                        (now, *key),
+                    )
+        return orjson.loads(row[0])
+
+    def set(
+        self,
+        device_id: str,
+        data: dict[str, Any],
+        year: int,
+        month: int | None = None,
+        day: int | None = None,
+    ) -> bool:
+        """Store a report if it is final, evicting reports when full.
+
+        Args:
+        ----
+            device_id: The device ID of the report.
+            data: The parsed report response.
+            year: Year of the period.
+            month: Month of the period, for monthly and daily periods.
+            day: Day of the period, for daily periods.
+
+        Returns:
+        -------
+            True if the report was stored.
+
+        """
+        if not is_final_report(data, year, month, day):
+            return False
+        blob = orjson.dumps(data)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        device_id,
+                        year,
+                        month or 0,
+                        day or 0,
+                        blob,
+                        len(blob),
+                        time.time(),
+                    ),
+                )
+                self._evict(connection)
+        return True
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Remove the least recently used reports over the limits."""
+        connection.execute(
+            "DELETE FROM reports WHERE rowid IN ("
+            "SELECT rowid FROM reports ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        if self.max_size is not None:
+            connection.execute(
+                "DELETE FROM reports WHERE rowid IN ("
+                "SELECT rowid FROM (SELECT rowid, SUM(size) OVER "
+                "(ORDER BY accessed DESC, rowid DESC) AS total FROM reports) "
+                "WHERE total > ?)",
+                (self.max_size,),
+            )
+
+    def clear(self) -> None:
+        """Remove all cached reports and reset the counters."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM reports")
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,208 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import socket
+import time
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientError, ClientResponseError
+
+from .exceptions import (
+    PowerfoxCircuitOpenError,
+    PowerfoxConnectionError,
+    PowerfoxError,
+    PowerfoxRateLimitError,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+def is_transient(error: PowerfoxError) -> bool:
+    """Return whether an error may go away when the request is repeated.
+
+    Timeouts, network errors, rate limiting and server errors (HTTP 5xx)
+    are transient. Errors like failed authentication or HTTP 404 are not.
+
+    Args:
+    ----
+        error: The error raised by the request.
+
+    Returns:
+    -------
+        True if the request is worth repeating.
+
+    """
+    if isinstance(error, PowerfoxRateLimitError):
+        return True
+    if not isinstance(error, PowerfoxConnectionError) or isinstance(
+        error, PowerfoxCircuitOpenError
+    ):
+        return False
+    cause = error.__cause__
+    if isinstance(cause, ClientResponseError):
+        return cause.status >= 500
+    return isinstance(cause, TimeoutError | ClientError | socket.gaierror)
+
+
+@dataclass
+class RetryPolicy:
+    """Policy for repeating idempotent requests that failed transiently.
+
+    Waits a random time between zero and an exponentially growing delay
+    between attempts ("full jitter"), so clients that failed together do
+    not retry together. Rate limited requests wait at least as long as the
+    API asked for.
+    """
+
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    deadline: float | None = 60.0
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before the next attempt.
+
+        Args:
+        ----
+            attempt: Number of attempts made so far, starting at 1.
+
+        Returns:
+        -------
+            The delay in seconds.
+
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)  # noqa: S311
+
+
+class CircuitState(StrEnum):
+    """Enum for the states of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    """Circuit breaker failing fast while the API or device is down.
+
+    After `failure_threshold` transient failures in a row the circuit
+    opens and requests fail immediately with PowerfoxCircuitOpenError.
+    Once `reset_timeout` seconds have passed, a single probe request is let
+    through: if it succeeds the circuit closes again, otherwise it stays
+    open for another `reset_timeout`.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+    state: CircuitState = field(default=CircuitState.CLOSED, init=False)
+    failures: int = field(default=0, init=False)
+
+    _opened_at: float = field(default=0.0, init=False, repr=False)
+
+    def before_request(self) -> None:
+        """Check whether a request may be sent.
+
+        Raises
+        ------
+            PowerfoxCircuitOpenError: The circuit is open.
+
+        """
+        if self.state is CircuitState.CLOSED:
+            return
+        now = time.monotonic()
+        if now - self._opened_at < self.reset_timeout:
+            msg = "Circuit breaker is open, not sending the request."
+            raise PowerfoxCircuitOpenError(msg)
+        # Let one probe through, the others keep failing fast until it
+        # either closes the circuit or opens it for another timeout.
+        self.state = CircuitState.HALF_OPEN
+        self._opened_at = now
+
+    def record_success(self) -> None:
+        """Close the circuit after a request reached the other side."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the circuit when needed."""
+        self.failures += 1
+        if (
+            self.state is CircuitState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+
+async def send_with_policies(
+    send: Callable[[], Awaitable[bytes]],
+    *,
+    retry_policy: RetryPolicy | None,
+    circuit_breaker: CircuitBreaker | None,
+    idempotent: bool,
+) -> bytes:
+    """Send a request, applying the retry policy and circuit breaker.
+
+    Args:
+    ----
+        send: Sends the request once.
+        retry_policy: Policy for repeating failed requests, if any.
+        circuit_breaker: Circuit breaker guarding the target, if any.
+        idempotent: Whether the request is safe to repeat.
+
+    Returns:
+    -------
+        The result of the first successful attempt.
+
+    Raises:
+    ------
+        PowerfoxCircuitOpenError: The circuit breaker is open.
+        PowerfoxError: The last error, when the request can not be repeated.
+
+    """
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        if circuit_breaker is not None:
+            circuit_breaker.before_request()
+        try:
+            result = await send()
+        except PowerfoxError as err:
+            transient = is_transient(err)
+            if circuit_breaker is not None:
+                # Any answer, including a rate limit, means the other side is up.
+                if transient and not isinstance(err, PowerfoxRateLimitError):
+                    circuit_breaker.record_failure()
+                else:
+                    circuit_breaker.record_success()
+            if (
+                retry_policy is None
+                or not idempotent
+                or not transient
+                or attempt >= retry_policy.attempts
+            ):
+                raise
+            delay = retry_policy.backoff(attempt)
+            # Only PowerfoxRateLimitError carries the delay the API asked for.
+            if retry_after := getattr(err, "retry_after", None):
+                delay = max(delay, retry_after)
+            if (
+                retry_policy.deadline is not None
+                and time.monotonic() - started + delay > retry_policy.deadline
+            ):
+                raise
+            await asyncio.sleep(delay)
+        else:
+            if circuit_breaker is not None:
+                circuit_breaker.record_success()
+            return result
@@ -0,0 +1,252 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .models import LOCAL_OBIS_FIELDS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .models import LocalResponse, LocalSample
+
+# Columns of the buffer, besides the timestamps.
+SAMPLE_COLUMNS: tuple[str, ...] = tuple(LOCAL_OBIS_FIELDS.values())
+
+
+@dataclass(slots=True)
+class _Window:
+    """Rolling power statistics over the samples of the last `seconds`."""
+
+    seconds: float
+    # Sequence number of the oldest sample in the window.
+    start: int = 0
+    count: int = 0
+    total: float = 0.0
+    # Sequence numbers of candidate minima and maxima, in order, with
+    # increasing (minima) or decreasing (maxima) power.
+    minima: deque[int] = field(default_factory=deque)
+    maxima: deque[int] = field(default_factory=deque)
+
+
+class LocalSampleBuffer:
+    """Fixed-size ring buffer of local samples with rolling statistics.
+
+    Keeps the last `capacity` samples in preallocated float64 arrays: the
+    timestamp, power and energy counters, with NaN for missing values.
+    For every window in `windows` (in seconds) the mean, minimum and
+    maximum power are updated incrementally, in amortised O(1) time per
+    sample. Windows are relative to the newest sample and never hold more
+    than `capacity` samples.
+    """
+
+    __slots__ = ("_columns", "_next", "_timestamps", "_windows", "capacity")
+
+    def __init__(self, capacity: int, windows: Iterable[float] = (60.0,)) -> None:
+        """Initialize an empty buffer.
+
+        Args:
+        ----
+            capacity: Maximum number of samples kept.
+            windows: Lengths in seconds of the rolling windows.
+
+        Raises:
+        ------
+            ValueError: If the capacity or a window is not positive.
+
+        """
+        if capacity < 1:
+            msg = "Parameter 'capacity' must be at least 1."
+            raise ValueError(msg)
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._columns = {
+            name: array("d", [math.nan]) * capacity for name in SAMPLE_COLUMNS
+        }
+        # Sequence number of the next sample; slot is sequence % capacity.
+        self._next = 0
+        self._windows: dict[float, _Window] = {}
+        for seconds in windows:
+            if seconds <= 0:
+                msg = "Window lengths must be positive."
+                raise ValueError(msg)
+            self._windows[seconds] = _Window(seconds)
+
+    def __len__(self) -> int:
+        """Return the number of samples in the buffer."""
+        return min(self._next, self.capacity)
+
+    @property
+    def windows(self) -> tuple[float, ...]:
+        """Return the lengths in seconds of the rolling windows."""
+        return tuple(self._windows)
+
+    def append(
+        self,
+        sample: LocalSample | LocalResponse,
+        timestamp: float | None = None,
+    ) -> None:
+        """Add a sample, replacing the oldest one when the buffer is full.
+
+        Args:
+        ----
+            sample: The sample to add.
+            timestamp: Time of the sample in seconds, defaults to its
+                `timestamp_epoch`. Pass a finer clock when sampling more than
+                once per second.
+
+        """
+        sequence = self._next
+        now = float(sample.timestamp_epoch if timestamp is None else timestamp)
+        for window in self._windows.values():
+            self._evict(window, sequence, now)
+
+        slot = sequence % self.capacity
+        self._timestamps[slot] = now
+        for name, column in self._columns.items():
+            value = getattr(sample, name)
+            column[slot] = math.nan if value is None else value
+        self._next = sequence + 1
+
+        power = self._columns["power"]
+        value = power[slot]
+        if math.isnan(value):
+            return
+        for window in self._windows.values():
+            window.count += 1
+            window.total += value
+            minima, maxima = window.minima, window.maxima
+            while minima and power[minima[-1] % self.capacity] >= value:
+                minima.pop()
+            minima.append(sequence)
+            while maxima and power[maxima[-1] % self.capacity] <= value:
+                maxima.pop()
+            maxima.append(sequence)
+
+    def _evict(self, window: _Window, sequence: int, now: float) -> None:
+        """Drop the samples leaving a window when sample `sequence` is added."""
+        oldest = sequence - self.capacity + 1
+        cutoff = now - window.seconds
+        power = self._columns["power"]
+        while window.start < sequence and (
+            window.start < oldest
+            or self._timestamps[window.start % self.capacity] < cutoff
+        ):
+            value = power[window.start % self.capacity]
+            if not math.isnan(value):
+                window.count -= 1
+                window.total -= value
+                if window.minima and window.minima[0] == window.start:
+                    window.minima.popleft()
+                if window.maxima and window.maxima[0] == window.start:
+                    window.maxima.popleft()
+            window.start += 1
+
+    def _window(self, seconds: float) -> _Window:
+        """Return a configured window."""
+        try:
+            return self._windows[seconds]
+        except KeyError:
+            msg = f"No rolling window of {seconds} seconds configured."
+            raise ValueError(msg) from None
+
+    def mean(self, seconds: float) -> float | None:
+        """Return the mean power over a window.
+
+        Args:
+        ----
+            seconds: Length of the window, one of `windows`.
+
+        Returns:
+        -------
+            The mean power in W, or None if the window holds no power values.
+
+        """
+        window = self._window(seconds)
+        return window.total / window.count if window.count else None
+
+    def min(self, seconds: float) -> float | None:
+        """Return the minimum power over a window.
+
+        Args:
+        ----
+            seconds: Length of the window, one of `windows`.
+
+        Returns:
+        -------
+            The minimum power in W, or None if the window holds no power values.
+
+        """
+        window = self._window(seconds)
+        if not window.minima:
+            return None
+        return self._columns["power"][window.minima[0] % self.capacity]
+
+    def max(self, seconds: float) -> float | None:
+        """Return the maximum power over a window.
+
+        Args:
+        ----
+            seconds: Length of the window, one of `windows`.
+
+        Returns:
+        -------
+            The maximum power in W, or None if the window holds no power values.
+
+        """
+        window = self._window(seconds)
+        if not window.maxima:
+            return None
+        return self._columns["power"][window.maxima[0] % self.capacity]
+
+    def rate(self, name: str, seconds: float) -> float | None:
+        """Return the rate of change of a column over a window.
+
+        For the energy counters (in Wh) this is the average power of the
+        import or export, multiply by 3600 for W.
+
+        Args:
+        ----
+            name: The column, for example, `energy_usage` or `energy_return`.
+            seconds: Length of the window, one of `windows`.
+
+        Returns:
+        -------
+            The change per second between the oldest and newest sample of
+            the window, or None if it can not be determined.
+
+        """
+        window = self._window(seconds)
+        if self._next - window.start < 2:
+            return None
+        column = self._columns[name]
+        first = window.start % self.capacity
+        last = (self._next - 1) % self.capacity
+        elapsed = self._timestamps[last] - self._timestamps[first]
+        change = column[last] - column[first]
+        if elapsed <= 0 or math.isnan(change):
+            return None
+        return change / elapsed
+
+    def column(self, name: str) -> list[float]:
+        """Return the values of a column, oldest first.
+
+        Args:
+        ----
+            name: `timestamp` or one of `SAMPLE_COLUMNS`.
+
+        Returns:
+        -------
+            The values, with NaN for missing values.
+
+        """
+        column = self._timestamps if name == "timestamp" else self._columns[name]
+        first = max(0, self._next - self.capacity)
+        return [
+            column[sequence % self.capacity] for sequence in range(first, self._next)
+        ]
@@ -0,0 +1,63 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SamplerStats:
+    """Statistics of a sampler, updated with every sample.
+
+    The lateness of a sample is the time between its scheduled tick and
+    the moment its request was sent. The jitter is the standard deviation
+    of the lateness.
+    """
+
+    samples: int = field(default=0, init=False)
+    skipped: int = field(default=0, init=False)
+    max_lateness: float = field(default=0.0, init=False)
+
+    _started: float | None = field(default=None, init=False, repr=False)
+    _last: float = field(default=0.0, init=False, repr=False)
+    _mean: float = field(default=0.0, init=False, repr=False)
+    _m2: float = field(default=0.0, init=False, repr=False)
+
+    def record(self, sent: float, lateness: float) -> None:
+        """Record a sample.
+
+        Args:
+        ----
+            sent: Monotonic time the request was sent at.
+            lateness: Seconds between the scheduled tick and `sent`.
+
+        """
+        if self._started is None:
+            self._started = sent
+        self._last = sent
+        self.samples += 1
+        self.max_lateness = max(self.max_lateness, lateness)
+        # Welford's online algorithm, so the stats take constant memory.
+        delta = lateness - self._mean
+        self._mean += delta / self.samples
+        self._m2 += delta * (lateness - self._mean)
+
+    @property
+    def rate(self) -> float:
+        """Return the achieved number of samples per second."""
+        if self._started is None or self._last <= self._started:
+            return 0.0
+        return (self.samples - 1) / (self._last - self._started)
+
+    @property
+    def mean_lateness(self) -> float:
+        """Return the mean lateness in seconds."""
+        return self._mean
+
+    @property
+    def jitter(self) -> float:
+        """Return the standard deviation of the lateness in seconds."""
+        if self.samples < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.samples - 1))
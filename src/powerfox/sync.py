@@ -0,0 +1,162 @@
+"""Asynchronous Python client for Powerfox."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from .history import ReportGranularity
+
+if TYPE_CHECKING:
+    from .models import DeviceReport, ReportValue
+    from .powerfox import Powerfox
+
+# Sections of DeviceReport holding report values.
+SECTIONS: tuple[str, ...] = ("gas", "consumption", "feed_in")
+
+
+@dataclass
+class ReportSyncResult:
+    """Object representing the changes found by a single sync run."""
+
+    device_id: str
+    added: dict[str, list[ReportValue]] = field(default_factory=dict)
+    updated: dict[str, list[ReportValue]] = field(default_factory=dict)
+    high_water_mark: int | None = None
+    periods: int = 0
+
+    @property
+    def changed(self) -> bool:
+        """Return whether any report value was added or updated."""
+        return bool(self.added or self.updated)
+
+
+@dataclass
+class ReportSync:
+    """Incremental synchronisation of the report values of devices.
+
+    Keeps a high-water mark per device: the epoch timestamp of the last
+    report value that is complete, with only complete values before it.
+    Each sync only requests the periods from that mark up to today, so its
+    cost depends on the amount of new data instead of the whole history.
+
+    The high-water marks can be persisted by the caller and passed in
+    again, together with a `start` for devices without a mark.
+    """
+
+    client: Powerfox
+    start: date
+    granularity: ReportGranularity | str = ReportGranularity.DAY
+    high_water_marks: dict[str, int] = field(default_factory=dict)
+
+    _values: dict[str, dict[str, dict[int, ReportValue]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def values(self, device_id: str, section: str) -> list[ReportValue]:
+        """Return the synced report values of a device, oldest first.
+
+        Args:
+        ----
+            device_id: The device ID.
+            section: The report section: `gas`, `consumption` or `feed_in`.
+
+        Returns:
+        -------
+            The report values of the section.
+
+        """
+        stored = self._values.get(device_id, {}).get(section, {})
+        return [stored[timestamp] for timestamp in sorted(stored)]
+
+    def forget(self, device_id: str) -> None:
+        """Drop the high-water mark and stored values of a device.
+
+        Args:
+        ----
+            device_id: The device ID.
+
+        """
+        self.high_water_marks.pop(device_id, None)
+        self._values.pop(device_id, None)
+
+    def _first_day(self, device_id: str) -> date:
+        """Return the first day to request for a device."""
+        if (mark := self.high_water_marks.get(device_id)) is None:
+            return self.start
+        # Periods follow the local time of the account, start a day early so
+        # the period holding the mark is requested in any timezone.
+        day = datetime.fromtimestamp(mark, tz=UTC).date() - timedelta(days=1)
+        return max(day, self.start)
+
+    def _merge(
+        self,
+        result: ReportSyncResult,
+        stored: dict[str, dict[int, ReportValue]],
+        seen: dict[int, bool],
+        report: DeviceReport,
+    ) -> None:
+        """Merge the values of a report into the stored values.
+
+        Also records in `seen` whether the values at each timestamp of the
+        report are complete in all sections.
+        """
+        for name in SECTIONS:
+            if (section := getattr(report, name)) is None:
+                continue
+            values = stored.setdefault(name, {})
+            for value in section.report_values:
+                timestamp = value.timestamp_epoch
+                seen[timestamp] = seen.get(timestamp, True) and value.complete
+                previous = values.get(timestamp)
+                if previous == value:
+                    continue
+                values[timestamp] = value
+                changes = result.added if previous is None else result.updated
+                changes.setdefault(name, []).append(value)
+
+    async def sync(self, device_id: str) -> ReportSyncResult:
+        """Fetch the new report values of a device.
+
+        Args:
+        ----
+            device_id: The device ID to sync.
+
+        Returns:
+        -------
+            The values that were added or changed since the last sync.
+
+        """
+        result = ReportSyncResult(device_id)
+        stored = self._values.setdefault(device_id, {})
+        seen: dict[int, bool] = {}
+        async for period in self.client.report_range(
+            device_id,
+            self._first_day(device_id),
+            datetime.now(tz=UTC).date(),
+            self.granularity,
+        ):
+            result.periods += 1
+            self._merge(result, stored, seen, period.report)
+
+        # The requested periods hold every value after the mark, so the new
+        # mark follows from the values seen in this run alone.
+        mark = self.high_water_marks.get(device_id)
+        incomplete = min(
+            (timestamp for timestamp, complete in seen.items() if not complete),
+            default=None,
+        )
+        result.high_water_mark = max(
+            (
+                timestamp
+                for timestamp, complete in seen.items()
+                if complete and (incomplete is None or timestamp < incomplete)
+            ),
+            default=mark,
+        )
+        if mark is not None and result.high_water_mark is not None:
+            result.high_water_mark = max(mark, result.high_water_mark)
+        if result.high_water_mark is not None:
+            self.high_water_marks[device_id] = result.high_water_mark
+        return result
@@ -0,0 +1,86 @@
+"""Tests for the realtime response cache."""
+
+from unittest.mock import patch
+
+from aiohttp import ClientSession
+from aresponses import ResponsesMockServer
+
+from powerfox import Powerfox, PowerMeter, ResponseCache
+
+from . import load_fixtures
+
+
+async def test_device_and_raw_data_share_entry(
+    aresponses: ResponsesMockServer,
+) -> None:
+    """Test device() and raw_device_data() are served from one entry."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/power_device_id/current",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("power_meter.json"),
+        ),
+    )
+    cache = ResponseCache(ttl=60)
+    async with ClientSession() as session:
+        client = Powerfox(
+            username="user",
+            password="pass",
+            session=session,
+            cache=cache,
+        )
+        assert isinstance(await client.device("power_device_id"), PowerMeter)
+        raw_data = await client.raw_device_data("power_device_id")
+        raw_data["Watt"] = 0
+        assert (await client.raw_device_data("power_device_id"))["Watt"] != 0
+
+    assert cache.misses == 1
+    assert cache.hits == 2
+    assert len(cache) == 1
+
+
+def test_fresh_reading_expires_with_timestamp() -> None:
+    """Test a fresh reading expires ttl seconds after its measurement."""
+    cache = ResponseCache(ttl=5)
+    with (
+        patch("powerfox.cache.time.time", return_value=1_000_003.0),
+        patch("powerfox.cache.time.monotonic", return_value=100.0),
+    ):
+        cache.set("key", {"Timestamp": 1_000_000})
+
+    with patch("powerfox.cache.time.monotonic", return_value=101.9):
+        assert cache.get("key") == {"Timestamp": 1_000_000}
+    with patch("powerfox.cache.time.monotonic", return_value=102.0):
+        assert cache.get("key") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_stale_reading_expires_after_ttl() -> None:
+    """Test a reading older than ttl is kept for ttl after fetching."""
+    cache = ResponseCache(ttl=5)
+    with patch("powerfox.cache.time.monotonic", return_value=100.0):
+        cache.set("key", {"Timestamp": 1_000_000})
+    with patch("powerfox.cache.time.monotonic", return_value=104.9):
+        assert cache.get("key")
+    with patch("powerfox.cache.time.monotonic", return_value=105.0):
+        assert cache.get("key") is None
+
+
+def test_least_recently_used_is_evicted() -> None:
+    """Test the least recently used reading is evicted when full."""
+    cache = ResponseCache(ttl=60, max_size=2)
+    cache.set("first", {})
+    cache.set("second", {})
+    assert cache.get("first") is not None
+    cache.set("third", {})
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
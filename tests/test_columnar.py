@@ -0,0 +1,112 @@
+"""Tests for the columnar report representation."""
+
+import math
+from datetime import UTC, datetime
+
+import orjson
+import pytest
+from aresponses import ResponsesMockServer
+
+from powerfox import DeviceReport, Powerfox, ReportColumns, ReportValue
+from powerfox.columnar import ColumnarReport
+from powerfox.decoders import json_decoder
+
+from . import load_fixtures
+
+
+def _report(fixture: str) -> DeviceReport:
+    """Decode a report fixture."""
+    return json_decoder(DeviceReport).decode(load_fixtures(fixture))
+
+
+def _consumption(fixture: str) -> list[ReportValue]:
+    """Return the consumption report values of a report fixture."""
+    section = _report(fixture).consumption
+    assert section is not None
+    return section.report_values
+
+
+@pytest.mark.parametrize("fixture", ["power_report.json", "gas_report.json"])
+def test_round_trip(fixture: str) -> None:
+    """Test report values survive the conversion to and from columns."""
+    report = _report(fixture)
+    for section in (report.consumption, report.feed_in, report.gas):
+        if section is None:
+            continue
+        columns = ReportColumns.from_report_values(section.report_values)
+        assert len(columns) == len(section.report_values)
+        assert columns.to_report_values() == section.report_values
+
+
+def test_from_raw_matches_report_values() -> None:
+    """Test building columns from the API response skips ReportValue objects."""
+    raw = orjson.loads(load_fixtures("power_report.json"))
+    columns = ReportColumns.from_raw(raw["Consumption"]["ReportValues"])
+    assert list(columns) == _consumption("power_report.json")
+    assert columns.timestamps.tolist() == [1765058400, 1765054800]
+    assert math.isnan(columns.floats["consumption"][0])
+
+
+def test_indexing() -> None:
+    """Test indexing and slicing build the matching report values."""
+    values = _consumption("power_report.json")
+    columns = ReportColumns.from_report_values(values)
+    assert columns[0] == values[0]
+    assert columns[-1] == values[-1]
+    assert columns[::-1] == values[::-1]
+    assert repr(columns) == "ReportColumns(len=2)"
+    with pytest.raises(IndexError):
+        columns[2]
+
+
+def test_device_ids_are_shared() -> None:
+    """Test each device ID is stored once, however many rows use it."""
+    values = [
+        ReportValue(
+            device_id=device_id,
+            timestamp=datetime.fromtimestamp(1765058400, tz=UTC),
+            complete=False,
+        )
+        for device_id in ("a", "a", "b", "a")
+    ]
+    columns = ReportColumns.from_report_values(values)
+    assert columns._device_ids == ["a", "b"]
+    assert [value.device_id for value in columns] == ["a", "a", "b", "a"]
+    assert columns[0].values_type is None
+
+
+def test_columns_expose_buffers() -> None:
+    """Test the columns can be shared with other libraries without copying."""
+    columns = ReportColumns.from_report_values(_consumption("power_report.json"))
+    assert memoryview(columns.timestamps).itemsize == 8
+    assert memoryview(columns.floats["delta"]).tolist() == [0, 0.009]
+
+
+async def test_columnar_report(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test the columnar report matches the regular report."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/power_device_id/report",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("power_report.json"),
+        ),
+    )
+    columnar = await powerfox_client.columnar_report("power_device_id", year=2025)
+    report = _report("power_report.json")
+    assert report.consumption
+    assert report.feed_in
+    assert isinstance(columnar, ColumnarReport)
+    assert columnar.gas is None
+    assert columnar.consumption
+    assert columnar.feed_in
+    assert list(columnar.consumption) == report.consumption.report_values
+    assert list(columnar.feed_in) == report.feed_in.report_values
+    assert columnar.report.consumption
+    assert columnar.report.consumption.sum == report.consumption.sum
+    assert columnar.report.consumption.report_values == []
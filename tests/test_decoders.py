@@ -0,0 +1,95 @@
+"""Tests for the shared decoder registry."""
+
+from datetime import UTC, datetime
+
+import orjson
+import pytest
+
+from powerfox import Device, LocalResponse, LocalSample, PowerMeter
+from powerfox.decoders import (
+    PowerOptiVariant,
+    data_decoder,
+    decode_local_sample,
+    json_decoder,
+)
+from powerfox.exceptions import PowerfoxError
+
+from . import load_fixtures
+
+
+def test_decoder_is_shared() -> None:
+    """Test the registry returns the same decoder for the same type."""
+    assert json_decoder(list[Device]) is json_decoder(list[Device])
+    assert json_decoder(PowerOptiVariant) is json_decoder(PowerOptiVariant)
+    assert json_decoder(LocalResponse) is not json_decoder(list[Device])
+
+
+def test_decoder_decodes_variant() -> None:
+    """Test the shared Poweropti decoder picks the matching subclass."""
+    power_meter = json_decoder(PowerOptiVariant).decode(
+        load_fixtures("power_meter_full.json")
+    )
+    assert isinstance(power_meter, PowerMeter)
+
+
+def test_data_decoder_decodes_parsed_payload() -> None:
+    """Test the data decoder accepts an already parsed payload."""
+    decoder = data_decoder(LocalResponse)
+    assert decoder is data_decoder(LocalResponse)
+    response = decoder.decode(orjson.loads(load_fixtures("local_value.json")))
+    assert response.power == 228
+
+
+def test_decode_local_sample() -> None:
+    """Test the fast path decodes the same values as LocalResponse."""
+    payload = load_fixtures("local_value.json")
+    sample = decode_local_sample(payload)
+    response = json_decoder(LocalResponse).decode(payload)
+    assert isinstance(sample, LocalSample)
+    assert sample.timestamp == response.timestamp
+    assert sample == (
+        response.timestamp_epoch,
+        response.power,
+        response.energy_usage,
+        response.energy_usage_high_tariff,
+        response.energy_usage_low_tariff,
+        response.energy_return,
+    )
+
+
+def test_decode_local_sample_partial() -> None:
+    """Test unknown OBIS codes are ignored and missing ones left empty."""
+    sample = decode_local_sample(
+        orjson.dumps(
+            {
+                "timestamp": 0,
+                "values": [
+                    {"obis": "2.8.0", "value": 181},
+                    {"obis": "99.99.99", "value": 999},
+                    {"value": 1},
+                ],
+            }
+        )
+    )
+    assert sample == LocalSample(timestamp_epoch=0, energy_return=181)
+    assert sample.timestamp == datetime(1970, 1, 1, tzinfo=UTC)
+    assert decode_local_sample(b'{"timestamp": 1}') == LocalSample(1)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"[]",
+        b"{",
+        b'{"values": []}',
+        b'{"timestamp": 1, "values": [1]}',
+        b'{"timestamp": 1, "values": 1}',
+        b'{"timestamp":"now","values":[{"obis":"1.7.0","value":"x"}]}',
+        b'{"timestamp": 1, "values": [{"obis": "1.7.0", "value": "x"}]}',
+        b'{"timestamp": null, "values": []}',
+    ],
+)
+def test_decode_local_sample_invalid(payload: bytes) -> None:
+    """Test invalid payloads raise a PowerfoxError."""
+    with pytest.raises(PowerfoxError):
+        decode_local_sample(payload)
@@ -61,9 +61,9 @@ async def test_embedded_invalid_json_payload(
             headers={"Content-Type": "application/json"},
         ),
     )
-    # Malformed JSON -> decode raises ValueError -> guard returns, raw text returned
+    # The guard only runs on parsed payloads -> raw body returned untouched
     result = await powerfox_client._request("test")
-    assert '"StatusCode"' in result
+    assert b'"StatusCode"' in result
 
 
 async def test_embedded_low_status_code_payload(
@@ -80,9 +80,9 @@ async def test_embedded_low_status_code_payload(
             headers={"Content-Type": "application/json"},
         ),
     )
-    # StatusCode < 400 -> guard returns, raw text returned
-    result = await powerfox_client._request("test")
-    assert result == '{"StatusCode": 200}'
+    # StatusCode < 400 -> guard returns, parsed payload returned
+    result = await powerfox_client._request_json("test")
+    assert result == {"StatusCode": 200}
 
 
 async def test_embedded_generic_error_payload(
@@ -0,0 +1,139 @@
+"""Tests for the fleet poller of local poweroptis."""
+
+import asyncio
+from contextlib import aclosing
+
+import pytest
+from aiohttp import ClientSession
+from aresponses import ResponsesMockServer
+
+from powerfox import LocalResponse, PowerfoxLocalFleet
+from powerfox.exceptions import PowerfoxConnectionError, PowerfoxError
+
+from . import load_fixtures
+
+
+async def test_poll(aresponses: ResponsesMockServer) -> None:
+    """Test readings and errors of all hosts are streamed, tagged by host."""
+    aresponses.add(
+        "192.168.1.50",
+        "/value",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("local_value.json"),
+        ),
+        repeat=aresponses.INFINITY,
+    )
+    aresponses.add(
+        "192.168.1.51",
+        "/value",
+        "GET",
+        aresponses.Response(status=500),
+        repeat=aresponses.INFINITY,
+    )
+    aresponses.add(
+        "192.168.1.52",
+        "/value",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text="{",
+        ),
+        repeat=aresponses.INFINITY,
+    )
+    readings: dict[str, list[object]] = {}
+    async with PowerfoxLocalFleet(
+        [
+            ("192.168.1.50", "key_1"),
+            ("192.168.1.51", "key_2"),
+            ("192.168.1.52", "key_3"),
+        ],
+        interval=0.05,
+    ) as fleet:
+        async with aclosing(fleet.poll()) as poll:
+            async for reading in poll:
+                readings.setdefault(reading.host, []).append(reading.result)
+                if all(len(results) >= 2 for results in readings.values()):
+                    break
+        assert not [
+            task
+            for task in asyncio.all_tasks()
+            if getattr(task.get_coro(), "__qualname__", None)
+            == "PowerfoxLocalFleet._poll_device"
+        ]
+        session = fleet.session
+        assert session
+        assert len({client.session for client in fleet._clients}) == 1
+
+    assert session.closed
+    assert list(readings) == ["192.168.1.50", "192.168.1.51", "192.168.1.52"]
+    assert all(isinstance(item, LocalResponse) for item in readings["192.168.1.50"])
+    assert all(
+        isinstance(item, PowerfoxConnectionError) for item in readings["192.168.1.51"]
+    )
+    # A host sending invalid responses keeps being polled.
+    assert all(
+        type(item) is PowerfoxError and "Unexpected response" in str(item)
+        for item in readings["192.168.1.52"]
+    )
+
+
+async def test_slow_host_is_isolated(aresponses: ResponsesMockServer) -> None:
+    """Test a host that does not answer does not hold up the others."""
+
+    async def slow(request: object) -> None:  # noqa: ARG001
+        await asyncio.sleep(1)
+
+    aresponses.add(
+        "192.168.1.50",
+        "/value",
+        "GET",
+        slow,
+        repeat=aresponses.INFINITY,
+    )
+    aresponses.add(
+        "192.168.1.51",
+        "/value",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("local_value.json"),
+        ),
+        repeat=aresponses.INFINITY,
+    )
+    hosts: list[str] = []
+    async with (
+        ClientSession() as session,
+        PowerfoxLocalFleet(
+            [("192.168.1.50", "key_1"), ("192.168.1.51", "key_2")],
+            interval=0.02,
+            request_timeout=0.1,
+            session=session,
+        ) as fleet,
+    ):
+        async for reading in fleet.poll():
+            hosts.append(reading.host)
+            if reading.host == "192.168.1.50":
+                assert isinstance(reading.result, PowerfoxConnectionError)
+                break
+        assert not session.closed
+
+    assert hosts.count("192.168.1.51") > 1
+
+
+async def test_poll_invalid_interval() -> None:
+    """Test polling rejects an interval that is not positive."""
+    fleet = PowerfoxLocalFleet([("192.168.1.50", "key")], interval=0)
+    with pytest.raises(ValueError, match="interval"):
+        await anext(fleet.poll())
+
+
+async def test_poll_without_devices() -> None:
+    """Test polling rejects an empty fleet instead of waiting forever."""
+    fleet = PowerfoxLocalFleet([])
+    with pytest.raises(ValueError, match="devices"):
+        await anext(fleet.poll())
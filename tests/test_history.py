@@ -0,0 +1,230 @@
+"""Tests for fetching reports over a date range."""
+
+import asyncio
+from contextlib import aclosing
+from datetime import UTC, date, datetime
+from unittest.mock import patch
+
+import pytest
+from aiohttp.web import Request
+from aresponses import Response, ResponsesMockServer
+
+from powerfox import Powerfox, ReportGranularity
+from powerfox.history import plan_report_periods
+
+from . import load_fixtures
+
+
+@pytest.mark.parametrize(
+    ("granularity", "expected"),
+    [
+        (
+            ReportGranularity.DAY,
+            [date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1)],
+        ),
+        (
+            ReportGranularity.MONTH,
+            [date(2024, 2, 1), date(2024, 3, 1)],
+        ),
+        (
+            ReportGranularity.YEAR,
+            [date(2024, 1, 1)],
+        ),
+    ],
+)
+def test_plan_report_periods(
+    granularity: ReportGranularity,
+    expected: list[date],
+) -> None:
+    """Test the periods overlapping a range are planned in order."""
+    periods = plan_report_periods(
+        datetime(2024, 2, 28, 12, 30, tzinfo=UTC),
+        date(2024, 3, 1),
+        granularity,
+    )
+    assert list(periods) == expected
+
+
+def test_plan_month_across_years() -> None:
+    """Test planning months across the end of a year."""
+    periods = plan_report_periods(
+        date(2023, 11, 15), date(2024, 2, 1), ReportGranularity.MONTH
+    )
+    assert [(period.year, period.month) for period in periods] == [
+        (2023, 11),
+        (2023, 12),
+        (2024, 1),
+        (2024, 2),
+    ]
+
+
+def test_granularity_params() -> None:
+    """Test the report filters for each granularity."""
+    period = date(2024, 12, 6)
+    assert ReportGranularity.YEAR.params(period) == {"year": 2024}
+    assert ReportGranularity.MONTH.params(period) == {"year": 2024, "month": 12}
+    assert ReportGranularity.DAY.params(period) == {
+        "year": 2024,
+        "month": 12,
+        "day": 6,
+    }
+
+
+async def test_report_range(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test reports are yielded in order and empty periods are skipped."""
+
+    async def response_handler(request: Request) -> Response:
+        # Answer the first day last, the order must still be kept.
+        day = int(request.query["day"])
+        await asyncio.sleep(0.03 if day == 1 else 0)
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text="{}" if day == 2 else load_fixtures("power_report.json"),
+        )
+
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/power_device_id/report",
+        "GET",
+        response_handler,
+        repeat=3,
+    )
+    periods = [
+        period
+        async for period in powerfox_client.report_range(
+            "power_device_id",
+            date(2024, 12, 1),
+            date(2024, 12, 3),
+            "day",
+            concurrency=3,
+        )
+    ]
+    assert [period.start for period in periods] == [
+        date(2024, 12, 1),
+        date(2024, 12, 3),
+    ]
+    assert all(period.granularity is ReportGranularity.DAY for period in periods)
+    assert periods[0].report.consumption
+
+
+async def test_report_range_stops_early(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test stopping early cancels the prefetched requests."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/power_device_id/report",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("power_report.json"),
+        ),
+        repeat=aresponses.INFINITY,
+    )
+    periods = powerfox_client.report_range(
+        "power_device_id",
+        date(2020, 1, 1),
+        date(2024, 12, 31),
+        ReportGranularity.MONTH,
+        concurrency=2,
+    )
+    async for period in periods:
+        assert period.start == date(2020, 1, 1)
+        break
+    await periods.aclose()
+    assert not powerfox_client._in_flight
+
+
+@pytest.mark.parametrize("concurrency", [1, 2, 4])
+async def test_report_range_concurrency(
+    powerfox_client: Powerfox,
+    concurrency: int,
+) -> None:
+    """Test no more than `concurrency` requests are in flight at once."""
+    in_flight = peak = 0
+
+    async def _send(*_args: object, **_kwargs: object) -> bytes:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            return load_fixtures("power_report.json").encode()
+        finally:
+            in_flight -= 1
+
+    with patch.object(powerfox_client, "_send", _send):
+        async for _ in powerfox_client.report_range(
+            "power_device_id",
+            date(2024, 12, 1),
+            date(2024, 12, 10),
+            concurrency=concurrency,
+        ):
+            await asyncio.sleep(0.002)
+    assert peak == concurrency
+
+
+async def test_report_range_cancel(powerfox_client: Powerfox) -> None:
+    """Test cancelling the consumer cancels the requests in flight."""
+    running = 0
+    all_sent = asyncio.Event()
+
+    async def _send(*_args: object, **_kwargs: object) -> bytes:
+        nonlocal running
+        running += 1
+        if running == 3:
+            all_sent.set()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            running -= 1
+        raise AssertionError  # pragma: no cover
+
+    async def _consume() -> None:
+        async with aclosing(
+            powerfox_client.report_range(
+                "power_device_id",
+                date(2024, 12, 1),
+                date(2024, 12, 10),
+                concurrency=3,
+            )
+        ) as periods:
+            async for _ in periods:
+                pass  # pragma: no cover
+
+    with patch.object(powerfox_client, "_send", _send):
+        consumer = asyncio.create_task(_consume())
+        await all_sent.wait()
+        consumer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await consumer
+        await asyncio.sleep(0)
+    assert running == 0
+    assert not powerfox_client._in_flight
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "concurrency"),
+    [
+        (date(2024, 1, 2), date(2024, 1, 1), 1),
+        (date(2024, 1, 1), date(2024, 1, 2), 0),
+    ],
+)
+async def test_report_range_invalid(
+    powerfox_client: Powerfox,
+    start: date,
+    end: date,
+    concurrency: int,
+) -> None:
+    """Test invalid ranges and concurrency raise ValueError."""
+    with pytest.raises(ValueError, match="must"):
+        async for _ in powerfox_client.report_range(
+            "power_device_id", start, end, concurrency=concurrency
+        ):
+            pass  # pragma: no cover
@@ -0,0 +1,377 @@
+"""Tests for the instrumentation of the Powerfox clients."""
+
+# pylint: disable=protected-access
+import asyncio
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import ClientSession
+from aresponses import ResponsesMockServer
+
+from powerfox import (
+    CircuitBreaker,
+    DecodeTiming,
+    Instrumentation,
+    Powerfox,
+    PowerfoxLocal,
+    RequestTiming,
+)
+from powerfox.exceptions import (
+    PowerfoxCircuitOpenError,
+    PowerfoxConnectionError,
+    PowerfoxError,
+)
+from powerfox.instrumentation import DISABLED, RequestTrace, _mark, decoding
+from powerfox.powerfox import _endpoint
+
+from . import load_fixtures
+
+
+class Recorder:
+    """Instrumentation hooks keeping the timings they receive."""
+
+    def __init__(self) -> None:
+        """Initialize without timings."""
+        self.requests: list[RequestTiming] = []
+        self.decodes: list[DecodeTiming] = []
+        self.errors: list[tuple[str, str]] = []
+        self.instrumentation = Instrumentation(
+            on_request=self.requests.append,
+            on_decode=self.decodes.append,
+            on_error=self.error,
+        )
+
+    def error(self, endpoint: str, error: PowerfoxError) -> None:
+        """Keep the endpoint and class of an error."""
+        self.errors.append((endpoint, type(error).__name__))
+
+
+def _add_current(aresponses: ResponsesMockServer, repeat: int = 1) -> None:
+    """Serve the realtime data of a power meter."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/9x9x1f12xx3x/current",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("power_meter.json"),
+        ),
+        repeat=repeat,
+    )
+
+
+async def test_request_timing(aresponses: ResponsesMockServer) -> None:
+    """Test the timings of requests on a traced session."""
+    _add_current(aresponses, repeat=2)
+    recorder = Recorder()
+    instrumentation = recorder.instrumentation
+    async with ClientSession(trace_configs=[instrumentation.trace_config()]) as session:
+        client = Powerfox(
+            username="user",
+            password="pass",
+            session=session,
+            instrumentation=instrumentation,
+        )
+        await client.device("9x9x1f12xx3x")
+        await client.device("9x9x1f12xx3x")
+
+    first, second = recorder.requests
+    assert first.method == "GET"
+    assert first.host == "backend.powerfox.energy"
+    assert first.endpoint == "my/{device_id}/current"
+    assert first.status == 200
+    assert first.size == len(load_fixtures("power_meter.json").encode())
+    assert first.error is None
+    assert first.reused is False
+    assert first.connect is not None
+    assert first.wait is not None
+    assert first.read is not None
+    assert first.total >= first.connect + first.wait + first.read
+    assert second.reused is True
+    assert second.connect is None
+    assert [timing.operation for timing in recorder.decodes] == [
+        "json",
+        "device",
+        "json",
+        "device",
+    ]
+
+
+async def test_request_timing_untraced(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test the timings of requests on a session without trace config."""
+    _add_current(aresponses)
+    recorder = Recorder()
+    powerfox_client.instrumentation = recorder.instrumentation
+    await powerfox_client.raw_device_data("9x9x1f12xx3x")
+
+    (timing,) = recorder.requests
+    assert timing.status == 200
+    assert timing.read is not None
+    assert timing.connect is None
+    assert timing.wait is None
+    assert timing.reused is None
+    assert [timing.operation for timing in recorder.decodes] == ["json"]
+
+
+async def test_request_timing_error(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test failed requests are reported with their status and error."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/all/devices",
+        "GET",
+        aresponses.Response(status=500),
+    )
+    recorder = Recorder()
+    powerfox_client.instrumentation = recorder.instrumentation
+    with pytest.raises(PowerfoxConnectionError):
+        await powerfox_client.all_devices()
+
+    (timing,) = recorder.requests
+    assert timing.endpoint == "my/all/devices"
+    assert timing.status == 500
+    assert timing.size is None
+    assert timing.error == "PowerfoxConnectionError"
+    assert recorder.decodes == []
+
+
+@pytest.mark.parametrize(
+    ("body", "call", "error"),
+    [
+        (
+            "[]",
+            lambda client: client.all_devices(),
+            ("my/all/devices", "PowerfoxNoDataError"),
+        ),
+        (
+            "{}",
+            lambda client: client.device("9x9x1f12xx3x"),
+            ("my/{device_id}/current", "PowerfoxNoDataError"),
+        ),
+        (
+            '{"Division": 9, "Timestamp": 1718812800, "Outdated": false}',
+            lambda client: client.device("9x9x1f12xx3x"),
+            ("my/{device_id}/current", "PowerfoxUnsupportedDeviceError"),
+        ),
+        (
+            "{}",
+            lambda client: client.report("9x9x1f12xx3x"),
+            ("my/{device_id}/report", "PowerfoxNoDataError"),
+        ),
+        (
+            '{"StatusCode": 412}',
+            lambda client: client.report("9x9x1f12xx3x"),
+            ("my/{device_id}/report", "PowerfoxPrivacyError"),
+        ),
+        (
+            '{"StatusCode": 500}',
+            lambda client: client.all_devices(),
+            ("my/all/devices", "PowerfoxError"),
+        ),
+    ],
+)
+async def test_response_errors(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+    body: str,
+    call: Callable[[Powerfox], Awaitable[object]],
+    error: tuple[str, str],
+) -> None:
+    """Test errors raised after a successful request are reported."""
+    endpoint = error[0].replace("{device_id}", "9x9x1f12xx3x")
+    aresponses.add(
+        "backend.powerfox.energy",
+        f"/api/2.0/{endpoint}",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=body,
+        ),
+    )
+    recorder = Recorder()
+    powerfox_client.instrumentation = recorder.instrumentation
+    with pytest.raises(PowerfoxError):
+        await call(powerfox_client)
+
+    (timing,) = recorder.requests
+    assert timing.error is None
+    assert recorder.errors == [error]
+
+
+async def test_circuit_open_error(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test requests refused by the circuit breaker are reported."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/all/devices",
+        "GET",
+        aresponses.Response(status=500),
+    )
+    recorder = Recorder()
+    powerfox_client.instrumentation = recorder.instrumentation
+    powerfox_client.circuit_breaker = CircuitBreaker(failure_threshold=1)
+    with pytest.raises(PowerfoxConnectionError):
+        await powerfox_client.all_devices()
+    with pytest.raises(PowerfoxCircuitOpenError):
+        await powerfox_client.all_devices()
+
+    (timing,) = recorder.requests
+    assert timing.error == "PowerfoxConnectionError"
+    assert recorder.errors == [("my/all/devices", "PowerfoxCircuitOpenError")]
+
+
+async def test_local_errors(
+    aresponses: ResponsesMockServer,
+    powerfox_local_client: PowerfoxLocal,
+) -> None:
+    """Test invalid responses and open circuits of the poweropti are reported."""
+    aresponses.add(
+        "192.168.1.50",
+        "/value",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text="{",
+        ),
+    )
+    aresponses.add("192.168.1.50", "/value", "GET", aresponses.Response(status=500))
+    recorder = Recorder()
+    powerfox_local_client.instrumentation = recorder.instrumentation
+    powerfox_local_client.circuit_breaker = CircuitBreaker(failure_threshold=1)
+    with pytest.raises(PowerfoxError, match="Unexpected response"):
+        await powerfox_local_client.value()
+    with pytest.raises(PowerfoxConnectionError):
+        await powerfox_local_client.value()
+    with pytest.raises(PowerfoxCircuitOpenError):
+        await powerfox_local_client.value()
+
+    assert [timing.error for timing in recorder.requests] == [
+        None,
+        "PowerfoxConnectionError",
+    ]
+    assert recorder.errors == [
+        ("value", "PowerfoxError"),
+        ("value", "PowerfoxCircuitOpenError"),
+    ]
+
+
+async def test_request_timing_cancelled(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test cancelled requests are reported as cancelled, not as errors."""
+    received = asyncio.Event()
+
+    async def slow(request: object) -> None:  # noqa: ARG001
+        received.set()
+        await asyncio.sleep(1)
+
+    aresponses.add(
+        "backend.powerfox.energy", "/api/2.0/my/9x9x1f12xx3x/current", "GET", slow
+    )
+    recorder = Recorder()
+    powerfox_client.instrumentation = recorder.instrumentation
+    task = asyncio.create_task(powerfox_client.device("9x9x1f12xx3x"))
+    await received.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    (timing,) = recorder.requests
+    assert timing.cancelled is True
+    assert timing.error is None
+
+
+async def test_local_timing(
+    aresponses: ResponsesMockServer,
+    powerfox_local_client: PowerfoxLocal,
+) -> None:
+    """Test the timings of requests to the local poweropti."""
+    aresponses.add(
+        "192.168.1.50",
+        "/value",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("local_value.json"),
+        ),
+    )
+    recorder = Recorder()
+    powerfox_local_client.instrumentation = recorder.instrumentation
+    await powerfox_local_client.value()
+
+    (timing,) = recorder.requests
+    assert timing.host == "192.168.1.50"
+    assert timing.endpoint == "value"
+    assert timing.status == 200
+    assert [timing.operation for timing in recorder.decodes] == ["value"]
+
+
+async def test_created_session_is_traced() -> None:
+    """Test the clients trace the sessions they create."""
+    instrumentation = Instrumentation()
+    async with (
+        Powerfox(
+            username="user", password="pass", instrumentation=instrumentation
+        ) as client,
+        PowerfoxLocal(
+            host="192.168.1.50", api_key="key", instrumentation=instrumentation
+        ) as local,
+    ):
+        assert len(client._ensure_session().trace_configs) == 1
+        assert len(local._ensure_session().trace_configs) == 1
+
+
+async def test_disabled(powerfox_client: Powerfox) -> None:
+    """Test the clients skip the timing without instrumentation."""
+    assert powerfox_client._trace("GET", "my/all/devices") is DISABLED
+    assert decoding(None, "device") is DISABLED
+    assert len(powerfox_client._ensure_session().trace_configs) == 0
+
+
+async def test_hooks_are_optional() -> None:
+    """Test timings are dropped when no hook is set."""
+    instrumentation = Instrumentation()
+    with instrumentation.request("GET", "host", "value") as trace:
+        trace.received(200)
+        trace.read(0)
+    with instrumentation.decoding("value"):
+        pass
+    instrumentation.report_error("value", PowerfoxError())
+
+
+async def test_other_requests_are_ignored() -> None:
+    """Test the trace config leaves requests without a trace alone."""
+    context = SimpleNamespace(trace_request_ctx=None)
+    await _mark("_sent", None, context, None)  # ty:ignore[invalid-argument-type]
+
+    trace = RequestTrace(Instrumentation(), "GET", "host", "value")
+    context.trace_request_ctx = trace
+    await _mark("_sent", None, context, None)  # ty:ignore[invalid-argument-type]
+    assert trace._sent is not None
+
+
+@pytest.mark.parametrize(
+    ("uri", "endpoint"),
+    [
+        ("my/all/devices", "my/all/devices"),
+        ("my/9x9x1f12xx3x/current", "my/{device_id}/current"),
+        ("my/9x9x1f12xx3x/report", "my/{device_id}/report"),
+        ("status", "status"),
+    ],
+)
+def test_endpoint(uri: str, endpoint: str) -> None:
+    """Test the device ID is left out of endpoints."""
+    assert _endpoint(uri) == endpoint
@@ -8,8 +8,9 @@ import pytest
 from aiohttp import ClientError, ClientResponse, ClientSession
 from aresponses import Response, ResponsesMockServer
 from syrupy.assertion import SnapshotAssertion
+from yarl import URL
 
-from powerfox import PowerfoxLocal
+from powerfox import LocalSample, PowerfoxLocal, SamplerStats
 from powerfox.exceptions import (
     PowerfoxAuthenticationError,
     PowerfoxConnectionError,
@@ -76,6 +77,9 @@ async def test_internal_session(aresponses: ResponsesMockServer) -> None:
     )
     async with PowerfoxLocal(host="192.168.1.50", api_key="1097bd725557") as client:
         await client._request("value")
+        assert isinstance(client.session, ClientSession)
+        assert client.session.connector
+        assert client.session.connector.limit_per_host == 1
 
 
 async def test_authentication_error(
@@ -171,3 +175,154 @@ async def test_response_status_404(
     )
     with pytest.raises(PowerfoxConnectionError):
         await powerfox_local_client._request("value")
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        "{",
+        "[]",
+        '{"values": []}',
+        '{"timestamp": "now", "values": []}',
+    ],
+)
+async def test_value_invalid(
+    aresponses: ResponsesMockServer,
+    powerfox_local_client: PowerfoxLocal,
+    payload: str,
+) -> None:
+    """Test invalid responses raise a PowerfoxError."""
+    aresponses.add(
+        "192.168.1.50",
+        "/value",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=payload,
+        ),
+    )
+    with pytest.raises(PowerfoxError, match="Unexpected response"):
+        await powerfox_local_client.value()
+
+
+async def test_base_url(aresponses: ResponsesMockServer) -> None:
+    """Test the client can be pointed at another URL than the host."""
+    aresponses.add(
+        "poweropti.test:8080",
+        "/value",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("local_value.json"),
+        ),
+    )
+    async with PowerfoxLocal(
+        host="192.168.1.50",
+        api_key="key",
+        base_url=URL("http://poweropti.test:8080/"),
+    ) as client:
+        assert (await client.value()).power == 228
+
+
+async def test_prewarm(aresponses: ResponsesMockServer) -> None:
+    """Test connections are opened ahead of the first request."""
+    aresponses.add(
+        "192.168.1.50",
+        "/",
+        "HEAD",
+        aresponses.Response(status=200),
+    )
+    async with PowerfoxLocal(host="192.168.1.50", api_key="1097bd725557") as client:
+        # Capped by the connection limit of the session it creates.
+        await client.prewarm(connections=3)
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_prewarm_timeout() -> None:
+    """Test a timeout while prewarming is wrapped."""
+    async with ClientSession() as session:
+        client = PowerfoxLocal(
+            host="192.168.1.50",
+            api_key="1097bd725557",
+            session=session,
+        )
+        with (
+            patch.object(session, "head", side_effect=TimeoutError),
+            pytest.raises(PowerfoxConnectionError),
+        ):
+            await client.prewarm()
+
+
+async def test_request_headers(
+    aresponses: ResponsesMockServer,
+    powerfox_local_client: PowerfoxLocal,
+) -> None:
+    """Test the API key header is sent with the request."""
+
+    async def response_handler(request: ClientResponse) -> Response:
+        assert request.headers["X-API-KEY"] == "1097bd725557"
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("local_value.json"),
+        )
+
+    aresponses.add("192.168.1.50", "/value", "GET", response_handler)
+    response = await powerfox_local_client.value()
+    assert response.power == 228
+
+
+async def test_sample(powerfox_local_client: PowerfoxLocal) -> None:
+    """Test sampling keeps its schedule and skips ticks when the device is slow."""
+    loop = asyncio.get_running_loop()
+    start = clock = loop.time()
+    durations = [0.2, 0.2, 2.5, 0.2, 0.2]
+    sent: list[float] = []
+
+    async def fake_send(uri: str) -> bytes:
+        nonlocal clock
+        assert uri == "value"
+        sent.append(clock - start)
+        clock += durations.pop(0)
+        return load_fixtures("local_value.json").encode()
+
+    async def fake_sleep(delay: float) -> None:
+        nonlocal clock
+        clock += delay
+
+    stats = SamplerStats()
+    with (
+        patch.object(powerfox_local_client, "_send", fake_send),
+        patch.object(loop, "time", lambda: clock),
+        patch("powerfox.local.asyncio.sleep", fake_sleep),
+    ):
+        samples = powerfox_local_client.sample(1.0, stats=stats)
+        async for value in samples:
+            assert isinstance(value, LocalSample)
+            assert value.power == 228
+            if not durations:
+                break
+
+    assert sent == pytest.approx([0, 1, 2, 4.5, 5])
+    assert stats.samples == 5
+    assert stats.skipped == 1
+    assert stats.rate == pytest.approx(0.8)
+    assert stats.max_lateness == pytest.approx(0.5)
+    assert stats.mean_lateness == pytest.approx(0.1)
+    assert stats.jitter == pytest.approx(0.05**0.5)
+
+
+def test_sampler_stats_empty() -> None:
+    """Test the statistics before enough samples were taken."""
+    stats = SamplerStats()
+    assert (stats.rate, stats.jitter, stats.mean_lateness) == (0, 0, 0)
+    stats.record(10.0, 0.1)
+    assert (stats.rate, stats.jitter) == (0, 0)
+
+
+async def test_sample_invalid_interval(powerfox_local_client: PowerfoxLocal) -> None:
+    """Test sampling rejects an interval that is not positive."""
+    with pytest.raises(ValueError, match="interval"):
+        await anext(powerfox_local_client.sample(0))
@@ -0,0 +1,216 @@
+"""Tests for the metrics collector."""
+
+import pytest
+from aresponses import ResponsesMockServer
+
+from powerfox import (
+    DecodeTiming,
+    Histogram,
+    Metrics,
+    Powerfox,
+    PowerfoxLocal,
+    RequestTiming,
+)
+from powerfox.exceptions import (
+    PowerfoxAuthenticationError,
+    PowerfoxError,
+    PowerfoxNoDataError,
+)
+
+from . import load_fixtures
+
+
+def _timing(
+    endpoint: str = "value",
+    total: float = 0.02,
+    size: int | None = 100,
+    error: str | None = None,
+) -> RequestTiming:
+    """Return the timing of a request."""
+    return RequestTiming(
+        method="GET",
+        host="192.168.1.50",
+        endpoint=endpoint,
+        status=200,
+        size=size,
+        total=total,
+        error=error,
+    )
+
+
+def test_histogram() -> None:
+    """Test observations are counted in the bucket of their upper bound."""
+    histogram = Histogram((1.0, 5.0))
+    for value in (0.5, 1.0, 3.0, 10.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.sum == 14.5
+    assert histogram.cumulative() == [(1.0, 2), (5.0, 3), (float("inf"), 4)]
+
+
+def test_counters() -> None:
+    """Test requests and errors are counted per endpoint."""
+    metrics = Metrics()
+    metrics.report_request(_timing())
+    metrics.report_request(_timing(size=None, error="PowerfoxConnectionError"))
+    metrics.report_request(_timing("my/all/devices", size=None, error="PowerfoxError"))
+    metrics.report_request(_timing(size=None, error="ClientPayloadError"))
+    metrics.report_request(
+        RequestTiming("GET", "host", "value", None, None, 0.5, cancelled=True)
+    )
+    metrics.report_decode(DecodeTiming("value", 0.0002))
+    metrics.report_error("value", PowerfoxError())
+    metrics.report_error("my/all/devices", PowerfoxNoDataError())
+
+    assert metrics.requests == {"value": 4, "my/all/devices": 1}
+    assert metrics.errors == {
+        ("value", "PowerfoxConnectionError"): 1,
+        ("my/all/devices", "PowerfoxError"): 1,
+        ("value", "PowerfoxError"): 1,
+        ("my/all/devices", "PowerfoxNoDataError"): 1,
+    }
+    # Only the exceptions of powerfox.exceptions are errors, and cancelled
+    # requests are left out of the latency.
+    assert metrics.latency["value"].count == 3
+    assert metrics.sizes["value"].count == 1
+    assert "my/all/devices" not in metrics.sizes
+    assert metrics.decode_latency["value"].count == 1
+
+
+def test_hooks_are_called() -> None:
+    """Test the hooks still receive the timings."""
+    requests: list[RequestTiming] = []
+    decodes: list[DecodeTiming] = []
+    errors: list[tuple[str, PowerfoxError]] = []
+    metrics = Metrics(
+        on_request=requests.append,
+        on_decode=decodes.append,
+        on_error=lambda endpoint, error: errors.append((endpoint, error)),
+    )
+    metrics.report_request(timing := _timing())
+    metrics.report_decode(decode := DecodeTiming("value", 0.0002))
+    metrics.report_error("value", error := PowerfoxError())
+    assert requests == [timing]
+    assert decodes == [decode]
+    assert errors == [("value", error)]
+
+
+def test_export() -> None:
+    """Test the metrics are exported in the Prometheus text format."""
+    metrics = Metrics(latency_buckets=(0.1,), decode_buckets=(0.001,), size_buckets=())
+    metrics.report_request(_timing("my/{device_id}/current", total=0.05, size=110))
+    metrics.report_request(
+        _timing(
+            "my/{device_id}/current",
+            total=0.5,
+            size=None,
+            error="PowerfoxConnectionError",
+        )
+    )
+    metrics.report_decode(DecodeTiming("device", 0.0005))
+
+    assert metrics.export() == (
+        "# HELP powerfox_requests_total Requests sent, by endpoint.\n"
+        "# TYPE powerfox_requests_total counter\n"
+        'powerfox_requests_total{endpoint="my/{device_id}/current"} 2\n'
+        "# HELP powerfox_request_errors_total Errors raised to the callers, "
+        "by endpoint and exception class.\n"
+        "# TYPE powerfox_request_errors_total counter\n"
+        "powerfox_request_errors_total"
+        '{endpoint="my/{device_id}/current",error="PowerfoxConnectionError"} 1\n'
+        "# HELP powerfox_request_duration_seconds Duration of the requests, "
+        "by endpoint.\n"
+        "# TYPE powerfox_request_duration_seconds histogram\n"
+        "powerfox_request_duration_seconds_bucket"
+        '{endpoint="my/{device_id}/current",le="0.1"} 1\n'
+        "powerfox_request_duration_seconds_bucket"
+        '{endpoint="my/{device_id}/current",le="+Inf"} 2\n'
+        "powerfox_request_duration_seconds_sum"
+        '{endpoint="my/{device_id}/current"} 0.55\n'
+        "powerfox_request_duration_seconds_count"
+        '{endpoint="my/{device_id}/current"} 2\n'
+        "# HELP powerfox_response_size_bytes Size of the response bodies, "
+        "by endpoint.\n"
+        "# TYPE powerfox_response_size_bytes histogram\n"
+        "powerfox_response_size_bytes_bucket"
+        '{endpoint="my/{device_id}/current",le="+Inf"} 1\n'
+        'powerfox_response_size_bytes_sum{endpoint="my/{device_id}/current"} 110.0\n'
+        'powerfox_response_size_bytes_count{endpoint="my/{device_id}/current"} 1\n'
+        "# HELP powerfox_decode_duration_seconds Time spent decoding responses, "
+        "by operation.\n"
+        "# TYPE powerfox_decode_duration_seconds histogram\n"
+        'powerfox_decode_duration_seconds_bucket{operation="device",le="0.001"} 1\n'
+        'powerfox_decode_duration_seconds_bucket{operation="device",le="+Inf"} 1\n'
+        'powerfox_decode_duration_seconds_sum{operation="device"} 0.0005\n'
+        'powerfox_decode_duration_seconds_count{operation="device"} 1\n'
+    )
+
+
+def test_export_empty() -> None:
+    """Test nothing is exported before the first request."""
+    assert Metrics().export() == ""
+
+
+def test_export_escapes_labels() -> None:
+    """Test label values are escaped."""
+    metrics = Metrics()
+    metrics.report_request(_timing('a"b\\c\nd'))
+    assert 'endpoint="a\\"b\\\\c\\nd"' in metrics.export(prefix="test")
+
+
+@pytest.mark.parametrize("total", [0.005, 0.0051])
+def test_bucket_bounds_are_inclusive(total: float) -> None:
+    """Test an observation on a bound is counted in that bucket."""
+    metrics = Metrics()
+    metrics.report_request(_timing(total=total))
+    assert metrics.latency["value"].counts[0] == (total <= 0.005)
+
+
+async def test_clients(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+    powerfox_local_client: PowerfoxLocal,
+) -> None:
+    """Test the metrics of both clients are collected together."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/all/devices",
+        "GET",
+        aresponses.Response(status=401),
+    )
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/all/devices",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text="[]",
+        ),
+    )
+    aresponses.add(
+        "192.168.1.50",
+        "/value",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("local_value.json"),
+        ),
+    )
+    metrics = Metrics()
+    powerfox_client.instrumentation = metrics
+    powerfox_local_client.instrumentation = metrics
+    with pytest.raises(PowerfoxAuthenticationError):
+        await powerfox_client.all_devices()
+    with pytest.raises(PowerfoxNoDataError):
+        await powerfox_client.all_devices()
+    await powerfox_local_client.value()
+
+    assert metrics.requests == {"my/all/devices": 2, "value": 1}
+    assert metrics.errors == {
+        ("my/all/devices", "PowerfoxAuthenticationError"): 1,
+        ("my/all/devices", "PowerfoxNoDataError"): 1,
+    }
+    assert list(metrics.decode_latency) == ["json", "value"]
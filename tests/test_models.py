@@ -1,21 +1,30 @@
 """Test the models for Powerfox."""
 
+from dataclasses import FrozenInstanceError
+from datetime import UTC, datetime
+from typing import get_args
+
 import pytest
 from aresponses import ResponsesMockServer
+from mashumaro.mixins.orjson import DataClassORJSONMixin
 from syrupy.assertion import SnapshotAssertion
 
 from powerfox import (
     Device,
     DeviceReport,
     DeviceType,
+    EnergyReport,
+    GasReport,
     HeatMeter,
     LocalResponse,
     Powerfox,
     PowerMeter,
     Poweropti,
+    ReportValue,
     WaterMeter,
 )
-from powerfox.models import _deserialize_timestamp
+from powerfox.decoders import PowerOptiVariant
+from powerfox.models import _deserialize_timestamp, _EpochDatetime
 
 from . import load_fixtures
 
@@ -272,3 +281,84 @@ def test_local_response_unknown_obis() -> None:
     )
     assert response.power == 228
     assert response.energy_usage is None
+
+
+@pytest.mark.parametrize(
+    ("model", "data", "attribute"),
+    [
+        (
+            Device,
+            {
+                "DeviceId": "9x9x1f12xx3x",
+                "AccountAssociatedSince": 1664702555,
+                "MainDevice": True,
+                "Prosumer": False,
+                "Division": 0,
+            },
+            "date_added",
+        ),
+        (WaterMeter, load_fixtures("water_meter.json"), "timestamp"),
+        (
+            ReportValue,
+            {"DeviceId": "9x9x1f12xx6x", "Timestamp": 1664702555, "Complete": True},
+            "timestamp",
+        ),
+        (LocalResponse, {"timestamp": 1664702555, "values": []}, "timestamp"),
+    ],
+)
+def test_lazy_timestamp(
+    model: type[DataClassORJSONMixin], data: str | dict, attribute: str
+) -> None:
+    """Test timestamps are kept as epoch seconds until they are accessed."""
+    decoded = model.from_json(data) if isinstance(data, str) else model.from_dict(data)
+    descriptor = getattr(model, attribute)
+    assert isinstance(descriptor, _EpochDatetime)
+    assert isinstance(descriptor._slot.__get__(decoded), int)
+    epoch = getattr(decoded, f"{attribute}_epoch")
+
+    value = getattr(decoded, attribute)
+    assert value == datetime.fromtimestamp(epoch, tz=UTC)
+    assert getattr(decoded, attribute) is value
+    assert getattr(decoded, f"{attribute}_epoch") == epoch
+    assert decoded.to_dict()[attribute] == value.isoformat()
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        Device,
+        DeviceReport,
+        EnergyReport,
+        GasReport,
+        HeatMeter,
+        LocalResponse,
+        PowerMeter,
+        Poweropti,
+        ReportValue,
+        WaterMeter,
+    ],
+)
+def test_models_are_slotted(model: type) -> None:
+    """Test the models store their fields in slots instead of a __dict__."""
+    assert "__slots__" in vars(model)
+    assert "__dict__" not in dir(model)
+
+
+def test_poweropti_variants() -> None:
+    """Test the Poweropti variants are the slotted, frozen subclasses."""
+    for variant in get_args(PowerOptiVariant):
+        assert issubclass(variant, Poweropti)
+        assert "__slots__" in vars(variant)
+        assert variant.__dataclass_params__.frozen
+
+
+def test_report_value_is_frozen() -> None:
+    """Test report values can not be changed after decoding."""
+    value = ReportValue(
+        device_id="9x9x1f12xx6x",
+        timestamp=datetime(1970, 1, 1, tzinfo=UTC),
+        complete=True,
+    )
+    with pytest.raises(FrozenInstanceError):
+        value.delta = 1.0  # ty: ignore[invalid-assignment]
+    assert value.timestamp == datetime(1970, 1, 1, tzinfo=UTC)
@@ -2,16 +2,20 @@
 
 # pylint: disable=protected-access
 import asyncio
+from datetime import UTC, datetime
 from unittest.mock import patch
 
 import pytest
 from aiohttp import ClientError, ClientResponse, ClientSession
 from aresponses import Response, ResponsesMockServer
+from yarl import URL
 
-from powerfox import Powerfox
+from powerfox import Powerfox, PowerMeter, WaterMeter
 from powerfox.exceptions import (
+    PowerfoxAuthenticationError,
     PowerfoxConnectionError,
     PowerfoxError,
+    PowerfoxNoDataError,
 )
 
 from . import load_fixtures
@@ -32,7 +36,8 @@ async def test_json_request(
             text=load_fixtures("all_devices.json"),
         ),
     )
-    await powerfox_client._request("test")
+    response = await powerfox_client._request("test")
+    assert response == load_fixtures("all_devices.json").encode()
     await powerfox_client.close()
 
 
@@ -48,8 +53,16 @@ async def test_internal_session(aresponses: ResponsesMockServer) -> None:
             text=load_fixtures("all_devices.json"),
         ),
     )
-    async with Powerfox(username="user", password="pass") as client:
+    async with Powerfox(
+        username="user",
+        password="pass",
+        connection_limit=4,
+        keepalive_timeout=15.0,
+    ) as client:
         await client._request("test")
+        assert isinstance(client.session, ClientSession)
+        assert client.session.connector
+        assert client.session.connector.limit_per_host == 4
 
 
 async def test_timeout(aresponses: ResponsesMockServer) -> None:
@@ -127,3 +140,435 @@ async def test_response_status_404(
     )
     with pytest.raises(PowerfoxConnectionError):
         assert await powerfox_client._request("test")
+
+
+async def test_devices_partial_failure(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test a failing device does not fail the whole batch."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/power_device_id/current",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("power_meter.json"),
+        ),
+    )
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/empty_device_id/current",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text="{}",
+        ),
+    )
+    results = await powerfox_client.devices(
+        ["power_device_id", "empty_device_id", "power_device_id"],
+        concurrency=1,
+    )
+    assert list(results) == ["power_device_id", "empty_device_id"]
+    assert isinstance(results["power_device_id"], PowerMeter)
+    assert isinstance(results["empty_device_id"], PowerfoxNoDataError)
+
+
+async def test_devices_authentication_error(powerfox_client: Powerfox) -> None:
+    """Test failed authentication stops the batch."""
+    requested: list[str] = []
+
+    async def _device(device_id: str) -> PowerMeter:
+        requested.append(device_id)
+        msg = "Authentication to the Powerfox API failed."
+        raise PowerfoxAuthenticationError(msg)
+
+    with (
+        patch.object(powerfox_client, "device", _device),
+        pytest.raises(PowerfoxAuthenticationError),
+    ):
+        await powerfox_client.devices(["one", "two", "three"], concurrency=1)
+    assert requested == ["one"]
+
+
+async def test_devices_unexpected_error(powerfox_client: Powerfox) -> None:
+    """Test an unexpected error cancels the other requests."""
+    cancelled: list[str] = []
+
+    async def _device(device_id: str) -> PowerMeter:
+        if device_id == "broken":
+            msg = "Invalid payload."
+            raise ValueError(msg)
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(device_id)
+            raise
+        raise AssertionError  # pragma: no cover
+
+    with (
+        patch.object(powerfox_client, "device", _device),
+        pytest.raises(ValueError, match="Invalid payload"),
+    ):
+        await powerfox_client.devices(["slow", "broken"])
+    assert cancelled == ["slow"]
+
+
+async def test_devices_invalid_concurrency(powerfox_client: Powerfox) -> None:
+    """Test a concurrency below 1 raises ValueError."""
+    with pytest.raises(ValueError, match="concurrency"):
+        await powerfox_client.devices(["power_device_id"], concurrency=0)
+
+
+async def test_all_current(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test all realtime devices of the account are fetched."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/all/devices",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("all_devices.json"),
+        ),
+    )
+    for device_id, fixture in (
+        ("9x9x1f12xx3x", "power_meter.json"),
+        ("9x9x1f12xx2x", "power_meter_full.json"),
+        ("9x9x1f12xx1x", "water_meter.json"),
+    ):
+        aresponses.add(
+            "backend.powerfox.energy",
+            f"/api/2.0/my/{device_id}/current",
+            "GET",
+            aresponses.Response(
+                status=200,
+                headers={"Content-Type": "application/json"},
+                text=load_fixtures(fixture),
+            ),
+        )
+    results = await powerfox_client.all_current()
+    # The FLOW gas meter has no realtime data and is skipped.
+    assert list(results) == ["9x9x1f12xx3x", "9x9x1f12xx2x", "9x9x1f12xx1x"]
+    assert isinstance(results["9x9x1f12xx1x"], WaterMeter)
+
+
+async def test_prewarm(aresponses: ResponsesMockServer) -> None:
+    """Test connections are opened ahead of the first request."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/",
+        "HEAD",
+        aresponses.Response(status=404),
+        repeat=2,
+    )
+    async with Powerfox(username="user", password="pass") as client:
+        await client.prewarm(connections=2)
+        assert client.session
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_base_url(aresponses: ResponsesMockServer) -> None:
+    """Test the client can be pointed at another API server."""
+    aresponses.add("powerfox.test", "/", "HEAD", aresponses.Response(status=404))
+    aresponses.add(
+        "powerfox.test",
+        "/api/2.0/my/all/devices",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("all_devices.json"),
+        ),
+    )
+    async with Powerfox(
+        username="user",
+        password="pass",
+        base_url=URL("http://powerfox.test/api/2.0/"),
+    ) as client:
+        await client.prewarm()
+        assert len(await client.all_devices()) == 4
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_prewarm_client_error() -> None:
+    """Test connection errors while prewarming are wrapped."""
+    async with ClientSession() as session:
+        client = Powerfox(username="user", password="pass", session=session)
+        with (
+            patch.object(session, "head", side_effect=ClientError),
+            pytest.raises(PowerfoxConnectionError),
+        ):
+            await client.prewarm()
+
+
+async def test_request_headers(aresponses: ResponsesMockServer) -> None:
+    """Test the precomputed headers are sent with every request."""
+
+    async def response_handler(request: ClientResponse) -> Response:
+        assert request.headers["Authorization"] == "Basic dXNlcjpwYXNz"
+        assert request.headers["Accept"] == "application/json"
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text="[]",
+        )
+
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/test",
+        "GET",
+        response_handler,
+        repeat=2,
+    )
+    async with Powerfox(username="user", password="pass") as client:
+        assert await client._request("test") == b"[]"
+        assert await client._request("test") == b"[]"
+
+
+async def test_identical_requests_are_coalesced(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test concurrent identical requests share one API request."""
+
+    async def response_handler(_: ClientResponse) -> Response:
+        await asyncio.sleep(0.05)
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("power_meter.json"),
+        )
+
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/my/power_device_id/current",
+        "GET",
+        response_handler,
+    )
+    results = await asyncio.gather(
+        *(powerfox_client.device("power_device_id") for _ in range(5))
+    )
+    assert all(result == results[0] for result in results)
+    assert not powerfox_client._in_flight
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_coalesced_requests_share_error(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test every caller of a coalesced request gets its error."""
+
+    async def response_handler(_: ClientResponse) -> Response:
+        await asyncio.sleep(0.05)
+        return aresponses.Response(status=500)
+
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/test",
+        "GET",
+        response_handler,
+    )
+    results = await asyncio.gather(
+        powerfox_client._request("test"),
+        powerfox_client._request("test"),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, PowerfoxConnectionError) for result in results)
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_cancelled_caller_does_not_cancel_request(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test cancelling one caller leaves the shared request running."""
+
+    async def response_handler(_: ClientResponse) -> Response:
+        await asyncio.sleep(0.05)
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text="[]",
+        )
+
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/test",
+        "GET",
+        response_handler,
+    )
+    cancelled = asyncio.create_task(powerfox_client._request("test"))
+    waiting = asyncio.create_task(powerfox_client._request("test"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    assert await waiting == b"[]"
+    assert cancelled.cancelled()
+
+
+async def test_cancelled_callers_cancel_request(powerfox_client: Powerfox) -> None:
+    """Test cancelling every caller cancels the shared request."""
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def _send(*_args: object, **_kwargs: object) -> bytes:
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        raise AssertionError  # pragma: no cover
+
+    with patch.object(powerfox_client, "_send", _send):
+        callers = [
+            asyncio.create_task(powerfox_client._request("test")) for _ in range(2)
+        ]
+        await started.wait()
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        assert not cancelled.is_set()
+
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.wait_for(cancelled.wait(), 1)
+    assert not powerfox_client._in_flight
+
+
+async def test_post_requests_are_not_coalesced(
+    aresponses: ResponsesMockServer,
+    powerfox_client: Powerfox,
+) -> None:
+    """Test only GET requests are coalesced."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/test",
+        "POST",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text="{}",
+        ),
+        repeat=2,
+    )
+    await asyncio.gather(
+        powerfox_client._request("test", method="POST"),
+        powerfox_client._request("test", method="POST"),
+    )
+    aresponses.assert_plan_strictly_followed()
+
+
+def _reading(timestamp: int, *, outdated: bool = False) -> PowerMeter:
+    """Return a power meter reading."""
+    return PowerMeter(
+        outdated=outdated,
+        timestamp=datetime.fromtimestamp(timestamp, tz=UTC),
+        power=100,
+        energy_usage=None,
+        energy_return=None,
+    )
+
+
+async def test_watch(powerfox_client: Powerfox) -> None:
+    """Test watch yields new readings on a drift-free schedule."""
+    readings = [
+        _reading(1),
+        _reading(1),
+        _reading(2, outdated=True),
+        _reading(2, outdated=True),
+        _reading(2, outdated=True),
+        _reading(3),
+        _reading(4),
+    ]
+    loop = asyncio.get_running_loop()
+    clock = loop.time()
+    delays: list[float] = []
+
+    async def fake_device(device_id: str) -> PowerMeter:  # noqa: ARG001
+        nonlocal clock
+        clock += 0.5  # Time spent on the request.
+        return readings.pop(0)
+
+    async def fake_sleep(delay: float) -> None:
+        nonlocal clock
+        delays.append(delay)
+        clock += delay
+
+    with (
+        patch.object(powerfox_client, "device", fake_device),
+        patch.object(loop, "time", lambda: clock),
+        patch("powerfox.powerfox.asyncio.sleep", fake_sleep),
+    ):
+        watched: list[int] = []
+        async for reading in powerfox_client.watch(
+            "power_device_id", 10, max_interval=30
+        ):
+            watched.append(reading.timestamp_epoch)
+            if reading.timestamp_epoch == 4:
+                break
+
+    assert watched == [1, 2, 3, 4]
+    # Request time is taken out of the delay; while outdated it doubles.
+    assert delays == [9.5, 9.5, 19.5, 29.5, 29.5, 9.5]
+
+
+async def test_watch_skips_missed_polls(powerfox_client: Powerfox) -> None:
+    """Test a slow consumer skips polls instead of catching up in a burst."""
+    loop = asyncio.get_running_loop()
+    clock = loop.time()
+    delays: list[float] = []
+
+    async def fake_device(device_id: str) -> PowerMeter:  # noqa: ARG001
+        return _reading(int(clock))
+
+    async def fake_sleep(delay: float) -> None:
+        nonlocal clock
+        delays.append(delay)
+        clock += delay
+
+    with (
+        patch.object(powerfox_client, "device", fake_device),
+        patch.object(loop, "time", lambda: clock),
+        patch("powerfox.powerfox.asyncio.sleep", fake_sleep),
+    ):
+        watch = powerfox_client.watch("power_device_id", 10)
+        await anext(watch)
+        clock += 25  # The consumer takes longer than two intervals.
+        await anext(watch)
+        await watch.aclose()
+
+    assert delays == [5]
+
+
+async def test_watch_invalid_interval(powerfox_client: Powerfox) -> None:
+    """Test watch rejects an interval that is not positive."""
+    with pytest.raises(ValueError, match="interval"):
+        await anext(powerfox_client.watch("power_device_id", 0))
+
+
+async def test_watch_cancel(powerfox_client: Powerfox) -> None:
+    """Test cancelling a watcher leaves no tasks behind."""
+    polled = asyncio.Event()
+
+    async def fake_device(device_id: str) -> PowerMeter:  # noqa: ARG001
+        polled.set()
+        return _reading(1)
+
+    async def consume() -> None:
+        async for _ in powerfox_client.watch("power_device_id", 60):
+            pass
+
+    with patch.object(powerfox_client, "device", fake_device):
+        task = asyncio.create_task(consume())
+        await polled.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert asyncio.all_tasks() == {asyncio.current_task()}
@@ -0,0 +1,107 @@
+"""Tests for the client-side rate limiter."""
+
+import time
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+from aresponses import ResponsesMockServer
+
+from powerfox import Powerfox, PowerfoxRateLimitError, RateLimiter
+from powerfox.ratelimit import parse_retry_after
+
+
+async def test_burst_then_rate() -> None:
+    """Test requests beyond the burst are spread out at the rate."""
+    limiter = RateLimiter(rate=50, burst=2)
+    start = time.monotonic()
+    for _ in range(4):
+        await limiter.acquire()
+    # Two from the burst, two more at 50 per second.
+    assert time.monotonic() - start >= 0.035
+
+
+async def test_throttled_waits_for_retry_after() -> None:
+    """Test a 429 blocks the limiter and halves the rate."""
+    limiter = RateLimiter(rate=100, burst=5, min_rate=30)
+    limiter.throttled(retry_after=0.05)
+    assert limiter.current_rate == 50
+    limiter.throttled(retry_after=0.05)
+    assert limiter.current_rate == 30
+
+    start = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - start >= 0.045
+
+    for _ in range(10):
+        limiter.succeeded()
+    assert limiter.current_rate == 100
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        (None, None),
+        ({}, None),
+        ({"Retry-After": "7"}, 7.0),
+        ({"Retry-After": "-1"}, 0.0),
+        ({"Retry-After": "soon"}, None),
+    ],
+)
+def test_parse_retry_after(
+    headers: dict[str, str] | None,
+    expected: float | None,
+) -> None:
+    """Test parsing the delay from a Retry-After header."""
+    assert parse_retry_after(headers) == expected
+
+
+def test_parse_retry_after_http_date() -> None:
+    """Test parsing a Retry-After header holding a HTTP date."""
+    retry_at = datetime.now(tz=UTC) + timedelta(seconds=30)
+    delay = parse_retry_after({"Retry-After": format_datetime(retry_at, usegmt=True)})
+    assert delay is not None
+    assert 28 < delay <= 30
+
+
+def test_parse_retry_after_naive_date() -> None:
+    """Test a HTTP date with a "-0000" offset is taken as UTC."""
+    retry_at = datetime.now(tz=UTC) + timedelta(seconds=30)
+    value = retry_at.strftime("%a, %d %b %Y %H:%M:%S -0000")
+    delay = parse_retry_after({"Retry-After": value})
+    assert delay is not None
+    assert 28 < delay <= 30
+    assert parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 -0000"}) == 0
+
+
+async def test_too_many_requests(aresponses: ResponsesMockServer) -> None:
+    """Test HTTP 429 raises and slows down the shared rate limiter."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/test",
+        "GET",
+        aresponses.Response(status=429, headers={"Retry-After": "0"}),
+    )
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/test",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text="[]",
+        ),
+    )
+    limiter = RateLimiter(rate=10)
+    async with Powerfox(
+        username="user",
+        password="pass",
+        rate_limiter=limiter,
+    ) as client:
+        with pytest.raises(PowerfoxRateLimitError) as exc:
+            await client._request("test")
+        assert exc.value.retry_after == 0
+        assert limiter.current_rate == 5
+
+        assert await client._request("test") == b"[]"
+        assert limiter.current_rate == 6
@@ -0,0 +1,170 @@
+"""Tests for the persistent report cache."""
+
+import sqlite3
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import orjson
+import pytest
+from aiohttp import ClientSession
+from aresponses import ResponsesMockServer
+
+from powerfox import DeviceReport, Powerfox, ReportCache
+from powerfox.reportcache import is_final_report, period_end
+
+from . import load_fixtures
+
+
+def _report(*, complete: bool = True) -> dict[str, Any]:
+    """Return a parsed report response."""
+    data = orjson.loads(load_fixtures("power_report.json"))
+    data["Consumption"]["ReportValues"][0]["Complete"] = complete
+    return data
+
+
+@pytest.mark.parametrize(
+    ("period", "end"),
+    [
+        ((2024,), datetime(2025, 1, 1, tzinfo=UTC)),
+        ((2024, 2), datetime(2024, 3, 1, tzinfo=UTC)),
+        ((2024, 12), datetime(2025, 1, 1, tzinfo=UTC)),
+        ((2024, 2, 29), datetime(2024, 3, 1, tzinfo=UTC)),
+        ((2024, 12, 31), datetime(2025, 1, 1, tzinfo=UTC)),
+    ],
+)
+def test_period_end(period: tuple[int, ...], end: datetime) -> None:
+    """Test the end of yearly, monthly and daily periods."""
+    assert period_end(*period) == end
+
+
+def test_is_final_report() -> None:
+    """Test only complete reports of closed periods are final."""
+    assert is_final_report(_report(), 2024, 5)
+    assert not is_final_report(_report(complete=False), 2024, 5)
+    assert not is_final_report(_report(), datetime.now(tz=UTC).year)
+    assert is_final_report({"Consumption": {"Sum": 0}}, 2024)
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    """Test final reports are stored and served, other reports are not."""
+    cache = ReportCache(tmp_path / "reports.db")
+    assert cache.get("device", 2024, 5) is None
+    assert cache.set("device", _report(), 2024, 5)
+    assert not cache.set("device", _report(complete=False), 2024, 6)
+
+    assert cache.get("device", 2024, 5) == _report()
+    assert cache.get("device", 2024) is None
+    assert cache.get("other", 2024, 5) is None
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+    cache.close()
+    cache.close()
+
+
+def test_shared_between_instances(tmp_path: Path) -> None:
+    """Test the cache persists and can be shared by several instances."""
+    path = tmp_path / "reports.db"
+    writer = ReportCache(path)
+    reader = ReportCache(path)
+    assert reader.get("device", 2024, 5, 1) is None
+    writer.set("device", _report(), 2024, 5, 1)
+    assert reader.get("device", 2024, 5, 1) == _report()
+    writer.close()
+    reader.close()
+
+    assert ReportCache(path).get("device", 2024, 5, 1) == _report()
+
+
+def test_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Test the least recently used reports are removed when full."""
+    cache = ReportCache(tmp_path / "reports.db", max_entries=2, access_resolution=0)
+    cache.set("device", _report(), 2024, 1)
+    cache.set("device", _report(), 2024, 2)
+    assert cache.get("device", 2024, 1)
+    cache.set("device", _report(), 2024, 3)
+
+    assert len(cache) == 2
+    assert cache.get("device", 2024, 2) is None
+    assert cache.get("device", 2024, 1)
+    assert cache.get("device", 2024, 3)
+
+
+def test_access_resolution(tmp_path: Path) -> None:
+    """Test hits only record the access once the last one is old enough."""
+    cache = ReportCache(tmp_path / "reports.db")
+    cache.set("device", _report(), 2024, 1)
+    with patch("powerfox.reportcache.time.time", return_value=1e10):
+        cache.set("device", _report(), 2024, 2)
+    with patch("powerfox.reportcache.time.time", return_value=1e10 + 30):
+        assert cache.get("device", 2024, 1)
+        assert cache.get("device", 2024, 2)
+    cache.close()
+
+    with sqlite3.connect(tmp_path / "reports.db") as connection:
+        accessed = dict(connection.execute("SELECT month, accessed FROM reports"))
+    assert accessed == {1: 1e10 + 30, 2: 1e10}
+
+
+def test_evicts_over_max_size(tmp_path: Path) -> None:
+    """Test reports are removed when the cache grows over max_size bytes."""
+    size = len(orjson.dumps(_report()))
+    cache = ReportCache(tmp_path / "reports.db", max_size=size * 2 + 1)
+    for month in range(1, 5):
+        cache.set("device", _report(), 2024, month)
+
+    assert len(cache) == 2
+    assert cache.get("device", 2024, 3)
+    assert cache.get("device", 2024, 4)
+
+
+async def test_report_served_from_cache(
+    aresponses: ResponsesMockServer,
+    tmp_path: Path,
+) -> None:
+    """Test final reports are only requested once."""
+    for _ in range(2):
+        aresponses.add(
+            "backend.powerfox.energy",
+            "/api/2.0/my/power_device_id/report",
+            "GET",
+            aresponses.Response(
+                status=200,
+                headers={"Content-Type": "application/json"},
+                text=load_fixtures("power_report.json"),
+            ),
+        )
+    cache = ReportCache(tmp_path / "reports.db")
+    async with ClientSession() as session:
+        client = Powerfox(
+            username="user",
+            password="pass",
+            session=session,
+            report_cache=cache,
+        )
+        threads: set[int] = set()
+        get = cache.get
+
+        def _get(*args: Any) -> dict[str, Any] | None:
+            threads.add(threading.get_ident())
+            return get(*args)
+
+        with patch.object(cache, "get", _get):
+            first = await client.report("power_device_id", year=2024, month=5)
+        # The database is not used on the event loop.
+        assert threads
+        assert threading.get_ident() not in threads
+        second = await client.report("power_device_id", year=2024, month=5)
+        assert isinstance(second, DeviceReport)
+        assert second == first
+        # Reports of the last 24 hours are always requested.
+        await client.report("power_device_id")
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    aresponses.assert_plan_strictly_followed()
@@ -0,0 +1,213 @@
+"""Tests for the retry policy and circuit breaker."""
+
+# pylint: disable=protected-access
+from unittest.mock import patch
+
+import pytest
+from aiohttp import ClientError, ClientSession
+from aresponses import ResponsesMockServer
+
+from powerfox import (
+    CircuitBreaker,
+    CircuitState,
+    Powerfox,
+    PowerfoxAuthenticationError,
+    PowerfoxCircuitOpenError,
+    PowerfoxConnectionError,
+    PowerfoxLocal,
+    PowerfoxRateLimitError,
+    RetryPolicy,
+)
+from powerfox.resilience import is_transient
+
+from . import load_fixtures
+
+FAST_RETRY = RetryPolicy(attempts=3, base_delay=0.001, max_delay=0.001)
+
+
+async def test_retry_server_error(aresponses: ResponsesMockServer) -> None:
+    """Test a server error is retried until the request succeeds."""
+    for status in (503, 500):
+        aresponses.add(
+            "backend.powerfox.energy",
+            "/api/2.0/test",
+            "GET",
+            aresponses.Response(status=status),
+        )
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/test",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text="[]",
+        ),
+    )
+    async with Powerfox(
+        username="user",
+        password="pass",
+        retry_policy=FAST_RETRY,
+    ) as client:
+        assert await client._request("test") == b"[]"
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_retry_gives_up(aresponses: ResponsesMockServer) -> None:
+    """Test the last error is raised once all attempts are used."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/test",
+        "GET",
+        aresponses.Response(status=500),
+        repeat=3,
+    )
+    async with Powerfox(
+        username="user",
+        password="pass",
+        retry_policy=FAST_RETRY,
+    ) as client:
+        with pytest.raises(PowerfoxConnectionError):
+            await client._request("test")
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.parametrize(("status", "method"), [(404, "GET"), (500, "POST")])
+async def test_no_retry(
+    aresponses: ResponsesMockServer,
+    status: int,
+    method: str,
+) -> None:
+    """Test permanent errors and non-idempotent requests are not retried."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/test",
+        method,
+        aresponses.Response(status=status),
+    )
+    async with Powerfox(
+        username="user",
+        password="pass",
+        retry_policy=FAST_RETRY,
+    ) as client:
+        with pytest.raises(PowerfoxConnectionError):
+            await client._request("test", method=method)
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_retry_deadline(aresponses: ResponsesMockServer) -> None:
+    """Test no retry is made when it would end after the deadline."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/test",
+        "GET",
+        aresponses.Response(status=429, headers={"Retry-After": "30"}),
+    )
+    async with Powerfox(
+        username="user",
+        password="pass",
+        retry_policy=RetryPolicy(deadline=10),
+    ) as client:
+        with pytest.raises(PowerfoxRateLimitError):
+            await client._request("test")
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_local_retry_timeout(aresponses: ResponsesMockServer) -> None:
+    """Test the local client retries a failed request."""
+    aresponses.add(
+        "192.168.1.50",
+        "/value",
+        "GET",
+        aresponses.Response(status=502),
+    )
+    aresponses.add(
+        "192.168.1.50",
+        "/value",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("local_value.json"),
+        ),
+    )
+    async with PowerfoxLocal(
+        host="192.168.1.50",
+        api_key="1097bd725557",
+        retry_policy=FAST_RETRY,
+    ) as client:
+        assert (await client.value()).power == 228
+
+
+async def test_circuit_opens_and_probes() -> None:
+    """Test the circuit fails fast when open and probes after the timeout."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    async with ClientSession() as session:
+        client = PowerfoxLocal(
+            host="192.168.1.50",
+            api_key="1097bd725557",
+            session=session,
+            circuit_breaker=breaker,
+        )
+        with patch.object(session, "request", side_effect=ClientError) as request:
+            for _ in range(2):
+                with pytest.raises(PowerfoxConnectionError):
+                    await client._request("value")
+            assert breaker.state is CircuitState.OPEN
+
+            with pytest.raises(PowerfoxCircuitOpenError):
+                await client._request("value")
+            assert request.call_count == 2
+
+            # After the timeout a single probe goes out, it fails again.
+            breaker._opened_at -= 30
+            with pytest.raises(PowerfoxConnectionError) as exc:
+                await client._request("value")
+            assert not isinstance(exc.value, PowerfoxCircuitOpenError)
+            assert request.call_count == 3
+            assert breaker.state is CircuitState.OPEN
+
+    breaker._opened_at -= 30
+    breaker.before_request()
+    assert breaker.state is CircuitState.HALF_OPEN
+    with pytest.raises(PowerfoxCircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.failures == 0
+
+
+async def test_circuit_closes_on_answer(aresponses: ResponsesMockServer) -> None:
+    """Test any answer from the API counts as the API being up."""
+    aresponses.add(
+        "backend.powerfox.energy",
+        "/api/2.0/test",
+        "GET",
+        aresponses.Response(status=401),
+    )
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.failures = 1
+    async with Powerfox(
+        username="user",
+        password="pass",
+        circuit_breaker=breaker,
+    ) as client:
+        with pytest.raises(PowerfoxAuthenticationError):
+            await client._request("test")
+    assert breaker.failures == 0
+
+
+def test_is_transient() -> None:
+    """Test only errors caused by the network or server are transient."""
+    assert not is_transient(PowerfoxAuthenticationError("failed"))
+    assert not is_transient(PowerfoxCircuitOpenError("open"))
+    assert not is_transient(PowerfoxConnectionError("no cause"))
+    assert is_transient(PowerfoxRateLimitError("slow down"))
+
+
+def test_backoff_is_bounded() -> None:
+    """Test the jittered delay stays below the exponential ceiling."""
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+    assert 0 <= policy.backoff(1) <= 1
+    assert 0 <= policy.backoff(3) <= 4
+    assert 0 <= policy.backoff(10) <= 5
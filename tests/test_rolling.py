@@ -0,0 +1,106 @@
+"""Tests for the ring buffer of local samples."""
+
+import random
+
+import pytest
+
+from powerfox import LocalSample, LocalSampleBuffer
+from powerfox.decoders import decode_local_sample
+
+from . import load_fixtures
+
+
+def test_rolling_statistics_match_full_scan() -> None:
+    """Test the incremental statistics against a scan of the samples."""
+    rng = random.Random(42)  # noqa: S311
+    buffer = LocalSampleBuffer(capacity=50, windows=(10, 30))
+    samples: list[tuple[float, int | None]] = []
+    now = 0.0
+    for _ in range(500):
+        now += rng.choice((0.5, 1, 2))
+        power = None if rng.random() < 0.1 else rng.randint(-500, 3000)
+        buffer.append(LocalSample(0, power=power), timestamp=now)
+        samples.append((now, power))
+
+        kept = samples[-50:]
+        for seconds in buffer.windows:
+            powers = [
+                value
+                for timestamp, value in kept
+                if value is not None and timestamp >= now - seconds
+            ]
+            if powers:
+                assert buffer.mean(seconds) == pytest.approx(sum(powers) / len(powers))
+                assert buffer.min(seconds) == min(powers)
+                assert buffer.max(seconds) == max(powers)
+            else:
+                assert buffer.mean(seconds) is None
+                assert buffer.min(seconds) is None
+                assert buffer.max(seconds) is None
+
+    assert len(buffer) == 50
+    assert buffer.column("timestamp") == [timestamp for timestamp, _ in samples[-50:]]
+
+
+def test_rate() -> None:
+    """Test the rate of change of the energy counters."""
+    buffer = LocalSampleBuffer(capacity=10, windows=(60,))
+    assert buffer.rate("energy_usage", 60) is None
+
+    for second in range(0, 100, 10):
+        buffer.append(
+            LocalSample(second, energy_usage=1000 + second * 2, energy_return=None)
+        )
+    # The window holds the samples of the last 60 seconds: 30 up to 90.
+    assert buffer.rate("energy_usage", 60) == pytest.approx(2)
+    assert buffer.rate("energy_return", 60) is None
+
+    buffer.append(LocalSample(90, energy_usage=1200))
+    assert buffer.rate("energy_usage", 60) == pytest.approx((1200 - 1060) / 60)
+
+
+def test_window_limited_by_capacity() -> None:
+    """Test windows never hold more samples than the buffer."""
+    buffer = LocalSampleBuffer(capacity=3, windows=(3600,))
+    for second, power in enumerate((5, 1, 2, 3)):
+        buffer.append(LocalSample(second, power=power))
+    assert len(buffer) == 3
+    assert buffer.min(3600) == 1
+    buffer.append(LocalSample(4, power=4))
+    assert buffer.min(3600) == 2
+    assert buffer.mean(3600) == 3
+    assert buffer.column("power") == [2, 3, 4]
+
+
+def test_append_local_response() -> None:
+    """Test decoded responses can be added as well."""
+    buffer = LocalSampleBuffer(capacity=2)
+    buffer.append(decode_local_sample(load_fixtures("local_value.json")))
+    assert buffer.max(60) == 228
+    assert buffer.column("energy_return") == [181]
+    assert buffer.rate("power", 60) is None
+
+
+@pytest.mark.parametrize(
+    ("capacity", "windows", "message"),
+    [(0, (60,), "capacity"), (1, (0,), "positive")],
+)
+def test_invalid_arguments(capacity: int, windows: tuple[float], message: str) -> None:
+    """Test invalid capacities and windows are rejected."""
+    with pytest.raises(ValueError, match=message):
+        LocalSampleBuffer(capacity, windows)
+
+
+def test_unknown_window() -> None:
+    """Test asking for a window that is not configured."""
+    with pytest.raises(ValueError, match="30"):
+        LocalSampleBuffer(capacity=1).mean(30)
+
+
+def test_missing_power() -> None:
+    """Test windows without power values have no statistics."""
+    buffer = LocalSampleBuffer(capacity=2)
+    buffer.append(LocalSample(0, energy_usage=1))
+    assert (buffer.mean(60), buffer.min(60), buffer.max(60)) == (None, None, None)
+    buffer.append(LocalSample(0, energy_usage=2))
+    assert buffer.rate("energy_usage", 60) is None
@@ -0,0 +1,111 @@
+"""Tests for the incremental report synchronisation."""
+
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime
+from unittest.mock import patch
+
+from powerfox import (
+    DeviceReport,
+    EnergyReport,
+    Powerfox,
+    ReportGranularity,
+    ReportPeriod,
+    ReportSync,
+    ReportValue,
+)
+
+HOUR = 3600
+START = int(datetime(2025, 6, 1, tzinfo=UTC).timestamp())
+
+
+def _value(hour: int, *, complete: bool = True, delta: float = 1.0) -> ReportValue:
+    """Return an hourly report value."""
+    return ReportValue(
+        device_id="device",
+        timestamp=datetime.fromtimestamp(START + hour * HOUR, tz=UTC),
+        complete=complete,
+        values_type=1,
+        delta=delta,
+    )
+
+
+class FakeReports:
+    """Serve a fixed list of report values for any range."""
+
+    def __init__(self) -> None:
+        """Initialize without any values."""
+        self.values: list[ReportValue] = []
+        self.starts: list[date] = []
+
+    async def report_range(
+        self,
+        device_id: str,  # noqa: ARG002
+        start: date,
+        end: date,  # noqa: ARG002
+        granularity: ReportGranularity,
+    ) -> AsyncIterator[ReportPeriod]:
+        """Yield all values as a single period."""
+        self.starts.append(start)
+        if self.values:
+            report = DeviceReport(consumption=EnergyReport(report_values=self.values))
+            yield ReportPeriod(start, ReportGranularity(granularity), report)
+
+
+async def test_sync(powerfox_client: Powerfox) -> None:
+    """Test only new and changed values are reported and the mark advances."""
+    fake = FakeReports()
+    sync = ReportSync(powerfox_client, start=date(2025, 1, 1))
+    with patch.object(powerfox_client, "report_range", fake.report_range):
+        fake.values = [_value(0), _value(1), _value(2, complete=False)]
+        result = await sync.sync("device")
+        assert fake.starts[-1] == date(2025, 1, 1)
+        assert result.added == {"consumption": fake.values}
+        assert result.updated == {}
+        assert result.high_water_mark == START + HOUR
+        assert result.periods == 1
+
+        fake.values = [_value(1), _value(2, delta=2.0), _value(3, complete=False)]
+        result = await sync.sync("device")
+        assert fake.starts[-1] == date(2025, 5, 31)
+        assert result.added == {"consumption": [_value(3, complete=False)]}
+        assert result.updated == {"consumption": [_value(2, delta=2.0)]}
+        assert result.high_water_mark == START + 2 * HOUR
+        assert result.changed
+
+        result = await sync.sync("device")
+        assert not result.changed
+        assert result.high_water_mark == START + 2 * HOUR
+
+        fake.values = []
+        result = await sync.sync("device")
+        assert result.periods == 0
+        assert result.high_water_mark == START + 2 * HOUR
+
+    assert sync.high_water_marks == {"device": START + 2 * HOUR}
+    assert sync.values("device", "consumption") == [
+        _value(0),
+        _value(1),
+        _value(2, delta=2.0),
+        _value(3, complete=False),
+    ]
+    assert sync.values("device", "feed_in") == []
+
+    sync.forget("device")
+    assert sync.high_water_marks == {}
+    assert sync.values("device", "consumption") == []
+
+
+async def test_sync_resumes_from_mark(powerfox_client: Powerfox) -> None:
+    """Test a persisted high-water mark limits the requested periods."""
+    fake = FakeReports()
+    sync = ReportSync(
+        powerfox_client,
+        start=date(2025, 1, 1),
+        high_water_marks={"device": START + 5 * HOUR},
+    )
+    with patch.object(powerfox_client, "report_range", fake.report_range):
+        result = await sync.sync("device")
+
+    assert fake.starts == [date(2025, 5, 31)]
+    assert not result.changed
+    assert result.high_water_mark == START + 5 * HOUR